@@ -4,13 +4,30 @@ bt-sec-analyzer - Bluetooth Security Testing Framework
 Main package initialization.
 """
 
+import importlib
+from typing import Any
+
 __version__ = "0.1.0"
 __author__ = "mfscpayload-690"
 __license__ = "MIT"
 
-# Import core components for easier access
-from bt_sectester.core.engine import BTSecEngine
-from bt_sectester.utils.config import Config
-from bt_sectester.utils.logger import setup_logger
+# Core components are imported on first access (PEP 562) so that importing
+# the package, e.g. for `--help`, does not pull in the scanning/AI stacks.
+_LAZY_ATTRIBUTES = {
+    "BTSecEngine": "bt_sectester.core.engine",
+    "Config": "bt_sectester.utils.config",
+    "setup_logger": "bt_sectester.utils.logger",
+}
 
 __all__ = ["BTSecEngine", "Config", "setup_logger", "__version__"]
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve lazily imported package attributes."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -2,16 +2,22 @@
 Main entry point for bt-sec-analyzer GUI application.
 """
 
+import json
+import os
 import subprocess
 import sys
 import threading
 import time
+import urllib.request
 import webbrowser
 from pathlib import Path
 
 from bt_sectester.utils.config import Config
 from bt_sectester.utils.logger import setup_logger
 
+UI_DIR = Path(__file__).parent.parent / "ui"
+DIST_DIR = UI_DIR / "dist"
+
 
 def launch_backend(host: str = "127.0.0.1", port: int = 8745) -> None:
     """Start the FastAPI backend server."""
@@ -23,18 +29,53 @@ def launch_backend(host: str = "127.0.0.1", port: int = 8745) -> None:
         port=port,
         reload=False,
         log_level="warning",
+        # "auto" selects uvloop and httptools, installed via uvicorn[standard]
+        loop="auto",
+        http="auto",
+        access_log=False,
     )
 
 
+def wait_for_backend(host: str, port: int, timeout: float = 30.0) -> bool:
+    """
+    Poll the backend status endpoint until the engine reports ready.
+
+    Args:
+        host: Backend host
+        port: Backend port
+        timeout: Maximum seconds to wait
+
+    Returns:
+        True if the backend became ready before the timeout, False on timeout
+        or once the backend reports an engine error
+    """
+    url = f"http://{host}:{port}/api/status"
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                status = json.loads(response.read())
+        except (OSError, ValueError):
+            status = {}
+        if status.get("connected"):
+            return True
+        if status.get("error"):
+            # The engine failed to build; waiting longer won't help
+            return False
+        time.sleep(0.1)
+
+    return False
+
+
 def launch_frontend_dev() -> subprocess.Popen:
     """Start the Vite dev server (development only)."""
-    ui_dir = Path(__file__).parent.parent / "ui"
-    if not (ui_dir / "node_modules").exists():
+    if not (UI_DIR / "node_modules").exists():
         print("[*] Installing frontend dependencies...")
-        subprocess.run(["npm", "install"], cwd=ui_dir, check=True)
+        subprocess.run(["npm", "install"], cwd=UI_DIR, check=True)
     return subprocess.Popen(
         ["npm", "run", "dev", "--", "--open"],
-        cwd=ui_dir,
+        cwd=UI_DIR,
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
     )
@@ -61,15 +102,31 @@ def main() -> int:
             console=True,
         )
 
-        # Display ethical disclaimer
-        if config.ui.get("show_ethical_disclaimer", True):
-            print("\n" + "=" * 60)
-            print("  BT-SEC-ANALYZER")
-            print("  Bluetooth Security Testing Framework")
-            print("=" * 60)
-            print("\n  This tool is for AUTHORIZED security testing only.")
-            print("  Unauthorized use may be illegal and unethical.\n")
-            print("=" * 60 + "\n")
+        # Display ethical disclaimer unless terms were accepted up front
+        terms_accepted = "--accept-terms" in sys.argv or os.environ.get("BT_ACCEPT_TERMS") == "1"
+        if config.ui.get("show_ethical_disclaimer", True) and not terms_accepted:
+            if not (sys.stdin.isatty() and sys.stdout.isatty()):
+                print("[!] Non-interactive session: pass --accept-terms or set BT_ACCEPT_TERMS=1.")
+                return 1
+
+            sys.stdout.write(
+                "\n".join(
+                    [
+                        "",
+                        "=" * 60,
+                        "  BT-SEC-ANALYZER",
+                        "  Bluetooth Security Testing Framework",
+                        "=" * 60,
+                        "",
+                        "  This tool is for AUTHORIZED security testing only.",
+                        "  Unauthorized use may be illegal and unethical.",
+                        "",
+                        "=" * 60,
+                        "",
+                        "",
+                    ]
+                )
+            )
 
             response = input("Do you accept these terms? (yes/no): ").strip().lower()
             if response not in ["yes", "y"]:
@@ -96,20 +153,19 @@ def main() -> int:
         )
         backend_thread.start()
 
-        # Give backend a moment to start
-        time.sleep(1)
-        print("[+] Backend API running")
+        if wait_for_backend(backend_host, backend_port):
+            print("[+] Backend API running")
+        else:
+            print("[!] Backend did not report ready; continuing anyway")
 
         # Check if built frontend exists
-        dist_dir = Path(__file__).parent.parent / "ui" / "dist"
-        ui_dir = Path(__file__).parent.parent / "ui"
         vite_proc = None
 
-        if dist_dir.exists():
+        if DIST_DIR.is_dir():
             # Production: serve static files from dist/ via the API server
             frontend_url = f"http://{backend_host}:{backend_port}"
             print(f"[+] Serving built frontend at {frontend_url}")
-        elif ui_dir.exists() and (ui_dir / "package.json").exists():
+        elif (UI_DIR / "package.json").exists():
             # Development: launch Vite dev server
             print("[*] Starting Vite dev server...")
             vite_proc = launch_frontend_dev()
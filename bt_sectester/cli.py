@@ -2,22 +2,39 @@
 Command-line interface for bt-sec-analyzer.
 """
 
-import json
+import atexit
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import click
 from rich.console import Console
 from rich.table import Table
 
-from bt_sectester.core.engine import BTSecEngine
-from bt_sectester.modules.attacks.attack_simulator import AttackType
-from bt_sectester.modules.reporting.report_generator import ReportGenerator
-from bt_sectester.utils.config import Config
+try:
+    from click_repl import repl
+except ImportError:
+    repl = None
+
+from bt_sectester.utils import fastjson
+
+if TYPE_CHECKING:
+    from bt_sectester.core.engine import BTSecEngine
+
+# Engine, attack and reporting modules are imported inside the commands that
+# need them so `--help` and unrelated commands stay fast.
 
 console = Console()
 
+# CLI attack names → AttackType values (kept as strings to avoid importing
+# the attack module at startup)
+ATTACK_TYPE_VALUES = {
+    "dos": "dos_flood",
+    "deauth": "deauthentication",
+    "sniff": "passive_sniffing",
+    "pin-brute": "pin_bruteforce",
+}
+
 
 @click.group()
 @click.version_option(version="0.1.0")
@@ -26,13 +43,37 @@ console = Console()
 @click.pass_context
 def cli(ctx: click.Context, config: Optional[str], debug: bool) -> None:
     """bt-sec-analyzer - Bluetooth Security Testing Framework."""
+    from bt_sectester.utils.config import Config
+
     # Load configuration
     cfg = Config.load(config) if config else Config.load()
 
     if debug:
         cfg.set("logging.level", "DEBUG")
 
-    ctx.obj = {"config": cfg}
+    ctx.obj = {"config": cfg, "engine": None}
+
+
+def get_engine(ctx: click.Context) -> "BTSecEngine":
+    """
+    Get the process-wide engine, creating it on first use.
+
+    The engine is shut down once at interpreter exit, so consecutive
+    commands in a REPL session share a single initialization.
+
+    Args:
+        ctx: Click context holding the loaded configuration
+
+    Returns:
+        Shared engine instance
+    """
+    from bt_sectester.core.engine import BTSecEngine
+
+    obj = ctx.find_root().obj
+    if obj["engine"] is None:
+        obj["engine"] = BTSecEngine(obj["config"])
+        atexit.register(obj["engine"].shutdown)
+    return obj["engine"]
 
 
 @cli.command()
@@ -49,13 +90,11 @@ def scan(
     output: Optional[str],
 ) -> None:
     """Scan for Bluetooth devices."""
-    config = ctx.obj["config"]
-
     console.print(f"\n[bold cyan]Starting Bluetooth scan...[/bold cyan]")
     console.print(f"Duration: {duration}s | Classic: {classic} | BLE: {ble}\n")
 
     try:
-        engine = BTSecEngine(config)
+        engine = get_engine(ctx)
         devices = engine.scan_devices(duration=duration, classic=classic, ble=ble)
 
         if not devices:
@@ -81,12 +120,10 @@ def scan(
 
         # Save to file if requested
         if output:
-            with open(output, "w") as f:
-                json.dump(devices, f, indent=2)
+            with open(output, "wb") as f:
+                f.write(fastjson.dumps(devices, indent=True))
             console.print(f"\n[green]Results saved to {output}[/green]")
 
-        engine.shutdown()
-
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
         sys.exit(1)
@@ -98,12 +135,10 @@ def scan(
 @click.pass_context
 def enumerate(ctx: click.Context, mac: str, output: Optional[str]) -> None:
     """Enumerate services for a device."""
-    config = ctx.obj["config"]
-
     console.print(f"\n[bold cyan]Enumerating services for {mac}...[/bold cyan]\n")
 
     try:
-        engine = BTSecEngine(config)
+        engine = get_engine(ctx)
         services = engine.enumerate_services(mac)
 
         service_list = services.get("services", [])
@@ -129,19 +164,17 @@ def enumerate(ctx: click.Context, mac: str, output: Optional[str]) -> None:
 
         # Save to file if requested
         if output:
-            with open(output, "w") as f:
-                json.dump(services, f, indent=2)
+            with open(output, "wb") as f:
+                f.write(fastjson.dumps(services, indent=True))
             console.print(f"\n[green]Results saved to {output}[/green]")
 
-        engine.shutdown()
-
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
         sys.exit(1)
 
 
 @cli.command()
-@click.argument("attack_type", type=click.Choice(["dos", "deauth", "sniff", "pin-brute"]))
+@click.argument("attack_type", type=click.Choice(list(ATTACK_TYPE_VALUES)))
 @click.argument("target")
 @click.option("--duration", "-d", type=int, help="Attack duration in seconds")
 @click.option("--yes", "-y", is_flag=True, help="Skip confirmation prompt")
@@ -154,17 +187,11 @@ def simulate(
     yes: bool,
 ) -> None:
     """Execute security simulation."""
-    config = ctx.obj["config"]
+    from bt_sectester.modules.attacks.attack_simulator import AttackSimulator, AttackType
 
-    # Map CLI attack type to enum
-    attack_map = {
-        "dos": AttackType.DOS_FLOOD,
-        "deauth": AttackType.DEAUTH,
-        "sniff": AttackType.SNIFF,
-        "pin-brute": AttackType.PIN_BRUTE,
-    }
+    config = ctx.obj["config"]
 
-    attack_enum = attack_map[attack_type]
+    attack_enum = AttackType(ATTACK_TYPE_VALUES[attack_type])
 
     console.print(f"\n[bold yellow]⚠️  WARNING ⚠️[/bold yellow]")
     console.print(f"You are about to simulate: [bold]{attack_type.upper()}[/bold]")
@@ -179,10 +206,7 @@ def simulate(
             return
 
     try:
-        engine = BTSecEngine(config)
-
-        # Import attack simulator from engine
-        from bt_sectester.modules.attacks.attack_simulator import AttackSimulator
+        engine = get_engine(ctx)
 
         simulator = AttackSimulator(
             privilege_manager=engine.privilege_manager,
@@ -213,8 +237,6 @@ def simulate(
             for error in result.errors:
                 console.print(f"  - {error}")
 
-        engine.shutdown()
-
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
         sys.exit(1)
@@ -227,6 +249,8 @@ def simulate(
 @click.pass_context
 def report(ctx: click.Context, session_id: str, format: str, output: Optional[str]) -> None:
     """Generate report from session data."""
+    from bt_sectester.modules.reporting.report_generator import ReportGenerator
+
     config = ctx.obj["config"]
 
     console.print(f"\n[bold cyan]Generating {format.upper()} report...[/bold cyan]\n")
@@ -238,8 +262,8 @@ def report(ctx: click.Context, session_id: str, format: str, output: Optional[st
             console.print(f"[red]Session file not found: {session_file}[/red]")
             sys.exit(1)
 
-        with open(session_file, "r") as f:
-            session_data = json.load(f)
+        with open(session_file, "rb") as f:
+            session_data = fastjson.loads(f.read())
 
         # Generate report
         generator = ReportGenerator(
@@ -259,6 +283,19 @@ def report(ctx: click.Context, session_id: str, format: str, output: Optional[st
         sys.exit(1)
 
 
+@cli.command()
+@click.pass_context
+def shell(ctx: click.Context) -> None:
+    """Start an interactive shell that keeps the engine alive between commands."""
+    if repl is None:
+        console.print("[red]click-repl not installed. Run: pip install click-repl[/red]")
+        sys.exit(1)
+
+    get_engine(ctx)
+    console.print("[bold cyan]bt-sec-analyzer shell[/bold cyan] (type :help, Ctrl+D to exit)\n")
+    repl(ctx)
+
+
 def main() -> None:
     """CLI entry point."""
     cli()
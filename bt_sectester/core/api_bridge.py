@@ -6,22 +6,46 @@ communicates with. Bridges frontend calls to the core Python engine.
 """
 
 import asyncio
-import json
+import codecs
+import fcntl
 import logging
 import os
 import pty
-import select
+import re
+import socket
+import struct
 import subprocess
 import threading
-from datetime import datetime
+import time
+import uuid
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, Iterator, List, Optional
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
+from bt_sectester.modules.attacks.attack_simulator import AttackSimulator, AttackType
+from bt_sectester.utils import fastjson
+from bt_sectester.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Attack types the UI may request, keyed by their wire names
+ATTACK_TYPE_MAP = {
+    "dos_flood": AttackType.DOS_FLOOD,
+    "deauthentication": AttackType.DEAUTH,
+    "passive_sniffing": AttackType.SNIFF,
+    "pin_bruteforce": AttackType.PIN_BRUTE,
+}
+
+# Seconds a finished background scan is kept if its result is never fetched
+SCAN_JOB_TTL = 600.0
+
 # ---------------------------------------------------------------------------
 # Pydantic request / response models
 # ---------------------------------------------------------------------------
@@ -31,6 +55,7 @@ class ScanRequest(BaseModel):
     duration: int = 10
     classic: bool = True
     ble: bool = True
+    background: bool = False
 
 
 class AttackRequest(BaseModel):
@@ -59,6 +84,109 @@ class FrontendLogEntry(BaseModel):
     context: Optional[Dict[str, Any]] = None
 
 
+# ---------------------------------------------------------------------------
+# Frontend assets (checked once per process)
+# ---------------------------------------------------------------------------
+
+DIST_DIR = Path(__file__).parent.parent.parent / "ui" / "dist"
+DIST_DIR_EXISTS = DIST_DIR.is_dir()
+
+
+# ---------------------------------------------------------------------------
+# Adapter discovery
+# ---------------------------------------------------------------------------
+
+HCI_MAX_DEV = 16
+HCIGETDEVLIST = 0x800448D2  # _IOR('H', 210, int)
+ADAPTER_CACHE_TTL = 5.0
+
+_HCI_NAME_RE = re.compile(r"^hci\d+$")
+_adapter_cache: Dict[str, Any] = {}
+
+
+def _list_hci_adapters() -> List[str]:
+    """
+    List HCI adapter names without spawning hciconfig.
+
+    Queries the kernel with the HCIGETDEVLIST ioctl on a raw HCI socket and
+    falls back to /sys/class/bluetooth when Bluetooth sockets are unavailable.
+
+    Returns:
+        Adapter names (e.g. ["hci0", "hci1"])
+    """
+    try:
+        sock = socket.socket(socket.AF_BLUETOOTH, socket.SOCK_RAW, socket.BTPROTO_HCI)
+    except (AttributeError, OSError):
+        sysfs = Path("/sys/class/bluetooth")
+        if not sysfs.is_dir():
+            return []
+        return sorted(p.name for p in sysfs.iterdir() if _HCI_NAME_RE.match(p.name))
+
+    with sock:
+        # struct hci_dev_list_req { u16 dev_num; struct hci_dev_req { u16 id; u32 opt; }[] }
+        buf = bytearray(4 + HCI_MAX_DEV * 8)
+        struct.pack_into("=H", buf, 0, HCI_MAX_DEV)
+        try:
+            fcntl.ioctl(sock.fileno(), HCIGETDEVLIST, buf)
+        except OSError:
+            return []
+        (count,) = struct.unpack_from("=H", buf, 0)
+        return [f"hci{struct.unpack_from('=H', buf, 4 + i * 8)[0]}" for i in range(count)]
+
+
+def _cached_hci_adapters() -> List[str]:
+    """Return the adapter list, refreshing it at most every ADAPTER_CACHE_TTL seconds."""
+    now = time.monotonic()
+    if "adapters" not in _adapter_cache or now - _adapter_cache["fetched_at"] > ADAPTER_CACHE_TTL:
+        _adapter_cache["adapters"] = _list_hci_adapters()
+        _adapter_cache["fetched_at"] = now
+    return _adapter_cache["adapters"]
+
+
+# ---------------------------------------------------------------------------
+# Terminal streaming
+# ---------------------------------------------------------------------------
+
+PTY_READ_SIZE = 65536
+PTY_MAX_PENDING = 64 * 1024  # Flush immediately once this much output is queued
+PTY_COALESCE_DELAY = 0.005  # Seconds to wait for more output before sending
+
+
+# ---------------------------------------------------------------------------
+# Streaming helpers
+# ---------------------------------------------------------------------------
+
+STREAM_CHUNK_ITEMS = 256
+
+
+def _stream_json_list(key: str, items: List[Any]) -> StreamingResponse:
+    """
+    Stream ``{key: [...items]}`` as JSON without building the whole body.
+
+    Items are serialized in chunks of STREAM_CHUNK_ITEMS; Starlette iterates
+    the synchronous generator in its thread pool, keeping the loop free.
+
+    Args:
+        key: Top-level key of the JSON object
+        items: Items to serialize (snapshotted before streaming)
+
+    Returns:
+        Streaming JSON response
+    """
+    snapshot = list(items)
+
+    def generate() -> Iterator[bytes]:
+        yield b'{"' + key.encode("utf-8") + b'": ['
+        for start in range(0, len(snapshot), STREAM_CHUNK_ITEMS):
+            chunk = b",".join(
+                fastjson.dumps(item) for item in snapshot[start : start + STREAM_CHUNK_ITEMS]
+            )
+            yield chunk if start == 0 else b"," + chunk
+        yield b"]}"
+
+    return StreamingResponse(generate(), media_type="application/json")
+
+
 # ---------------------------------------------------------------------------
 # Application factory
 # ---------------------------------------------------------------------------
@@ -71,6 +199,7 @@ def create_app() -> FastAPI:
         title="bt-sec-analyzer API",
         version="0.1.0",
         description="Backend bridge for the bt-sec-analyzer desktop UI",
+        default_response_class=ORJSONResponse if fastjson.orjson is not None else JSONResponse,
     )
 
     app.add_middleware(
@@ -83,50 +212,153 @@ def create_app() -> FastAPI:
     # ---- Lazy engine singleton ------------------------------------------
 
     _engine_holder: Dict[str, Any] = {}
+    _engine_lock = threading.Lock()
 
     def get_engine():
         if "engine" not in _engine_holder:
-            from bt_sectester.core.engine import BTSecEngine
+            with _engine_lock:
+                if "engine" not in _engine_holder:
+                    from bt_sectester.core.engine import BTSecEngine
 
-            _engine_holder["engine"] = BTSecEngine()
+                    _engine_holder["engine"] = BTSecEngine()
         return _engine_holder["engine"]
 
+    def report_warmup_failure(fut: asyncio.Future) -> None:
+        if not fut.cancelled() and fut.exception() is not None:
+            # get_engine() raises again on the next request; /api/status reports it
+            logger.error("Engine initialization failed: %s", fut.exception())
+
+    @app.on_event("startup")
+    async def warm_engine():
+        # Build the engine while the server and UI come up, not on first request
+        fut = asyncio.get_running_loop().run_in_executor(None, get_engine)
+        fut.add_done_callback(report_warmup_failure)
+        _engine_holder["warmup"] = fut
+
     # ---- Log broadcasting -----------------------------------------------
 
-    log_subscribers: List[WebSocket] = []
+    # Subscriber → minimum log level it asked for
+    log_subscribers: Dict[WebSocket, int] = {}
+    ws_log_config = Config.get_instance().logging.websocket
+    flush_interval = ws_log_config.get("flush_interval_ms", 50) / 1000
 
     class WebSocketLogHandler(logging.Handler):
-        """Forward Python log records to all connected WebSocket clients."""
+        """Buffer Python log records for batched delivery to WebSocket clients."""
+
+        def __init__(self, buffer_size: int = 1000):
+            super().__init__()
+            self.pending: Deque[Dict[str, Any]] = deque(maxlen=buffer_size)
+            self.pending_lock = threading.Lock()
+            self.loop: Optional[asyncio.AbstractEventLoop] = None
+            self.wakeup: Optional[asyncio.Event] = None
+            # (second, formatted prefix), replaced as a whole so that
+            # concurrent emitters never pair a second with another's prefix
+            self._timestamp_cache = (-1, "")
+
+        def format_timestamp(self, created: float) -> str:
+            # Records arrive in bursts within the same second; only the
+            # fractional part changes, so the strftime result is reused.
+            second = int(created)
+            cached = self._timestamp_cache
+            if cached[0] != second:
+                cached = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+                self._timestamp_cache = cached
+            return f"{cached[1]}.{int((created - second) * 1_000_000):06d}"
 
         def emit(self, record: logging.LogRecord) -> None:
+            if not log_subscribers:
+                return
+
             entry = {
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": self.format_timestamp(record.created),
                 "level": record.levelname,
                 "message": self.format(record),
                 "logger": record.name,
             }
+            with self.pending_lock:
+                first = not self.pending
+                self.pending.append(entry)
+                full = len(self.pending) == self.pending.maxlen
+
+            # Cross into the loop only to start a batch, or to flush a full
+            # buffer early rather than silently dropping the oldest records
+            if (first or full) and self.loop is not None and self.wakeup is not None:
+                self.loop.call_soon_threadsafe(self.wakeup.set)
+
+        def drain(self) -> List[Dict[str, Any]]:
+            with self.pending_lock:
+                batch = list(self.pending)
+                self.pending.clear()
+            return batch
+
+    ws_handler = WebSocketLogHandler(buffer_size=ws_log_config.get("buffer_size", 1000))
+    ws_handler.setLevel(logging.INFO)
+    logging.getLogger("bt_sectester").addHandler(ws_handler)
+
+    def update_handler_level() -> None:
+        # Only pay for DEBUG records while someone is listening for them
+        ws_handler.setLevel(min(log_subscribers.values(), default=logging.INFO))
+
+    async def broadcast_logs() -> None:
+        """Send buffered log records as one frame per subscriber, batch by batch."""
+        while True:
+            # Idle until the first record of a batch arrives
+            await ws_handler.wakeup.wait()
+            ws_handler.wakeup.clear()
+
+            # Let the batch fill for up to flush_interval, unless the buffer fills first
+            try:
+                await asyncio.wait_for(ws_handler.wakeup.wait(), timeout=flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            ws_handler.wakeup.clear()
+
+            batch = ws_handler.drain()
+            if not batch or not log_subscribers:
+                continue
+
+            payloads: Dict[int, str] = {}
             dead: List[WebSocket] = []
-            for ws in log_subscribers:
+            for ws, min_level in list(log_subscribers.items()):
+                if min_level not in payloads:
+                    payloads[min_level] = fastjson.dumps(
+                        {
+                            "batch": [
+                                entry
+                                for entry in batch
+                                if logging.getLevelName(entry["level"]) >= min_level
+                            ]
+                        }
+                    ).decode("utf-8")
                 try:
-                    asyncio.run_coroutine_threadsafe(
-                        ws.send_json(entry),
-                        asyncio.get_event_loop(),
-                    )
+                    await ws.send_text(payloads[min_level])
                 except Exception:
                     dead.append(ws)
             for ws in dead:
-                log_subscribers.remove(ws)
+                log_subscribers.pop(ws, None)
+            if dead:
+                update_handler_level()
 
-    ws_handler = WebSocketLogHandler()
-    ws_handler.setLevel(logging.DEBUG)
-    logging.getLogger("bt_sectester").addHandler(ws_handler)
+    broadcast_task: Dict[str, asyncio.Task] = {}
+
+    @app.on_event("startup")
+    async def start_log_broadcast():
+        ws_handler.loop = asyncio.get_running_loop()
+        ws_handler.wakeup = asyncio.Event()
+        broadcast_task["task"] = asyncio.create_task(broadcast_logs())
+
+    @app.on_event("shutdown")
+    async def stop_log_broadcast():
+        task = broadcast_task.pop("task", None)
+        if task is not None:
+            task.cancel()
 
     # ---- REST endpoints -------------------------------------------------
 
     @app.get("/api/status")
     async def status():
         try:
-            engine = get_engine()
+            engine = await asyncio.to_thread(get_engine)
             return {
                 "connected": True,
                 "ethical_mode": engine.config.app.ethical_mode,
@@ -139,67 +371,119 @@ def create_app() -> FastAPI:
 
     @app.get("/api/adapters")
     async def adapters():
-        result = subprocess.run(
-            ["hciconfig"], capture_output=True, text=True, timeout=5
-        )
-        found = []
-        for line in result.stdout.splitlines():
-            if line and not line.startswith("\t"):
-                parts = line.split(":")
-                if parts:
-                    found.append({"id": parts[0].strip(), "name": parts[0].strip()})
+        found = [{"id": name, "name": name} for name in _cached_hci_adapters()]
         if not found:
             found = [{"id": "hci0", "name": "hci0"}]
         return {"adapters": found}
 
+    # Background scans until their result is fetched (or SCAN_JOB_TTL passes)
+    scan_jobs: Dict[str, Dict[str, Any]] = {}
+
+    # Scans share the scanner's device table, so only one runs at a time
+    scan_lock = threading.Lock()
+
+    def run_scan(req: ScanRequest) -> List[Dict[str, Any]]:
+        # Runs in a worker thread, so waiting for the engine to finish
+        # building (or for an earlier scan) never blocks the event loop
+        engine = get_engine()
+        with scan_lock:
+            return engine.scan_devices(req.duration, req.classic, req.ble)
+
+    def run_enumeration(mac: str) -> Dict[str, Any]:
+        # Enumerating a device missing from the last scan rescans for it
+        engine = get_engine()
+        with scan_lock:
+            return engine.enumerate_services(mac)
+
+    def evict_stale_scan_jobs() -> None:
+        cutoff = time.monotonic() - SCAN_JOB_TTL
+        for job_id, job in list(scan_jobs.items()):
+            if job.get("finished_at", cutoff) < cutoff:
+                del scan_jobs[job_id]
+
+    async def run_scan_job(job_id: str, req: ScanRequest) -> None:
+        job = scan_jobs[job_id]
+        try:
+            devices = await asyncio.to_thread(run_scan, req)
+            job.update(status="completed", devices=devices, count=len(devices))
+        except Exception as exc:
+            job.update(status="failed", error=str(exc))
+        job["finished_at"] = time.monotonic()
+        job.pop("task", None)
+
     @app.post("/api/scan")
     async def scan(req: ScanRequest):
-        engine = get_engine()
-        devices = engine.scan_devices(
-            duration=req.duration, classic=req.classic, ble=req.ble
-        )
+        if req.background:
+            evict_stale_scan_jobs()
+            job_id = uuid.uuid4().hex
+            scan_jobs[job_id] = {"job_id": job_id, "status": "running"}
+            scan_jobs[job_id]["task"] = asyncio.create_task(run_scan_job(job_id, req))
+            return {"job_id": job_id, "status": "running"}
+
+        devices = await asyncio.to_thread(run_scan, req)
         return {"devices": devices, "count": len(devices)}
 
+    @app.get("/api/scan/{job_id}")
+    async def scan_job(job_id: str):
+        job = scan_jobs.get(job_id)
+        if job is None:
+            return {"error": f"Unknown scan job: {job_id}"}
+        if "finished_at" in job:
+            # The result is handed out once
+            del scan_jobs[job_id]
+        return {key: value for key, value in job.items() if key not in ("task", "finished_at")}
+
     @app.get("/api/devices")
     async def devices():
-        engine = get_engine()
-        return {"devices": engine.session_data.get("devices", [])}
+        engine = await asyncio.to_thread(get_engine)
+        return _stream_json_list("devices", engine.session_data.get("devices", []))
 
     @app.get("/api/enumerate/{mac}")
     async def enumerate_services(mac: str):
-        engine = get_engine()
-        services = engine.enumerate_services(mac)
+        services = await asyncio.to_thread(run_enumeration, mac)
         return services
 
+    # One simulator (and worker pool) shared by all attack requests
+    _simulator_holder: Dict[str, AttackSimulator] = {}
+
+    def get_simulator() -> AttackSimulator:
+        if "simulator" not in _simulator_holder:
+            engine = get_engine()
+            _simulator_holder["simulator"] = AttackSimulator(
+                privilege_manager=engine.privilege_manager,
+                ethical_mode=engine.config.app.ethical_mode,
+            )
+        return _simulator_holder["simulator"]
+
+    @app.on_event("shutdown")
+    async def shutdown_simulator():
+        if "simulator" in _simulator_holder:
+            _simulator_holder.pop("simulator").shutdown()
+
+    @app.on_event("shutdown")
+    async def shutdown_engine():
+        # The engine is built in a worker thread, so it registers no signal
+        # or atexit handlers of its own; save the session and stop its
+        # elevated worker and pools here, after the simulator using them
+        if "engine" in _engine_holder:
+            await asyncio.to_thread(_engine_holder["engine"].shutdown)
+
     @app.post("/api/attack")
     async def attack(req: AttackRequest):
-        from bt_sectester.modules.attacks.attack_simulator import (
-            AttackSimulator,
-            AttackType,
-        )
+        engine = await asyncio.to_thread(get_engine)
+        simulator = get_simulator()
 
-        engine = get_engine()
-        simulator = AttackSimulator(
-            privilege_manager=engine.privilege_manager,
-            ethical_mode=engine.config.app.ethical_mode,
-        )
-
-        type_map = {
-            "dos_flood": AttackType.DOS_FLOOD,
-            "deauthentication": AttackType.DEAUTH,
-            "passive_sniffing": AttackType.SNIFF,
-            "pin_bruteforce": AttackType.PIN_BRUTE,
-        }
-        attack_type = type_map.get(req.attack_type)
+        attack_type = ATTACK_TYPE_MAP.get(req.attack_type)
         if attack_type is None:
             return {"error": f"Unknown attack type: {req.attack_type}"}
 
-        result = simulator.execute_attack(
+        future = simulator.execute_attack_async(
             attack_type=attack_type,
             target=req.target,
             duration=req.duration,
             parameters=req.parameters,
         )
+        result = await asyncio.wrap_future(future)
         result_dict = result.to_dict()
 
         # Persist in session
@@ -209,54 +493,66 @@ def create_app() -> FastAPI:
 
     @app.post("/api/attack/{attack_id}/stop")
     async def stop_attack(attack_id: str):
-        # Placeholder — proper implementation would track running attack refs
-        return {"stopped": True, "attack_id": attack_id}
+        simulator = _simulator_holder.get("simulator")
+        stopped = simulator is not None and simulator.stop_attack(attack_id)
+        return {"stopped": stopped, "attack_id": attack_id}
 
     @app.get("/api/attacks")
     async def get_attacks():
-        engine = get_engine()
-        return {"attacks": engine.session_data.get("attacks", [])}
+        engine = await asyncio.to_thread(get_engine)
+        return _stream_json_list("attacks", engine.session_data.get("attacks", []))
 
     @app.post("/api/report")
     async def report(req: ReportRequest):
-        from bt_sectester.modules.reporting.report_generator import ReportGenerator
+        from bt_sectester.modules.reporting.report_generator import get_report_generator
 
-        engine = get_engine()
-        generator = ReportGenerator(
-            output_dir=Path("reports"),
-            company_name=engine.config.reporting.get(
-                "company_name", "Security Assessment"
-            ),
+        engine = await asyncio.to_thread(get_engine)
+        generator = get_report_generator(
+            Path("reports"),
+            engine.config.reporting.get("company_name", "Security Assessment"),
         )
 
         if req.format == "html":
-            path = generator.generate_html_report(engine.session_data)
+            path = await asyncio.to_thread(generator.generate_html_report, engine.session_data)
         else:
-            path = generator.generate_pdf_report(engine.session_data)
+            path = await asyncio.to_thread(generator.generate_pdf_report, engine.session_data)
 
         return {"path": str(path), "format": req.format}
 
     @app.post("/api/ai/summarize")
     async def summarize(req: SummarizeRequest):
-        engine = get_engine()
-        if engine.ollama_client is None:
+        engine = await asyncio.to_thread(get_engine)
+        # First access connects to the Ollama server, so keep it off the loop
+        ollama_client = await asyncio.to_thread(lambda: engine.ollama_client)
+        if ollama_client is None:
             return {"summary": "Ollama is not available. Start Ollama and restart the backend."}
 
         logs_data = engine.session_data.get("logs", [])
-        summary = engine.ollama_client.summarize_logs(
-            logs_data, context=req.context or "Bluetooth security assessment"
+        if not logs_data and engine.audit_logger:
+            # Fall back to this session's audit trail, already formatted
+            logs_data = engine.audit_logger.formatted_bytes()
+        summary = await asyncio.to_thread(
+            ollama_client.summarize_logs,
+            logs_data,
+            context=req.context or "Bluetooth security assessment",
         )
         return {"summary": summary}
 
+    @lru_cache(maxsize=1)
+    def config_snapshot() -> Dict[str, Any]:
+        return get_engine().config.model_dump()
+
     @app.get("/api/config")
     async def get_config():
-        engine = get_engine()
-        return engine.config.dict()
+        # Wait for the engine off the loop; the snapshot itself is cached
+        await asyncio.to_thread(get_engine)
+        return config_snapshot()
 
     @app.patch("/api/config")
     async def patch_config(patch: ConfigPatch):
-        engine = get_engine()
+        engine = await asyncio.to_thread(get_engine)
         engine.config.set(patch.key, patch.value)
+        config_snapshot.cache_clear()
         return {"ok": True, "key": patch.key}
 
     @app.post("/api/log")
@@ -269,9 +565,10 @@ def create_app() -> FastAPI:
         return {"ok": True}
 
     @app.websocket("/ws/logs")
-    async def ws_logs(ws: WebSocket):
+    async def ws_logs(ws: WebSocket, level: str = "DEBUG"):
         await ws.accept()
-        log_subscribers.append(ws)
+        log_subscribers[ws] = getattr(logging, level.upper(), logging.DEBUG)
+        update_handler_level()
         try:
             while True:
                 # Keep connection alive; client doesn't send data
@@ -279,8 +576,8 @@ def create_app() -> FastAPI:
         except WebSocketDisconnect:
             pass
         finally:
-            if ws in log_subscribers:
-                log_subscribers.remove(ws)
+            log_subscribers.pop(ws, None)
+            update_handler_level()
 
     # ---- WebSocket: interactive terminal --------------------------------
 
@@ -288,6 +585,7 @@ def create_app() -> FastAPI:
     async def ws_terminal(ws: WebSocket):
         await ws.accept()
 
+        loop = asyncio.get_running_loop()
         master_fd, slave_fd = pty.openpty()
 
         shell = os.environ.get("SHELL", "/bin/bash")
@@ -299,40 +597,94 @@ def create_app() -> FastAPI:
             preexec_fn=os.setsid,
         )
         os.close(slave_fd)
-
-        # Read from PTY → send to WS
-        async def reader():
-            loop = asyncio.get_event_loop()
+        os.set_blocking(master_fd, False)
+
+        # Read from PTY → send to WS, driven by fd readiness on the event loop.
+        # Output is coalesced for a few milliseconds so bursts go out as one frame.
+        # Reads land in one reusable buffer; the incremental decoder keeps
+        # multi-byte characters that straddle a read boundary intact.
+        read_buf = bytearray(PTY_READ_SIZE)
+        read_view = memoryview(read_buf)
+        pending = bytearray()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        flush_handle: Optional[asyncio.TimerHandle] = None
+        # Frames go out through one sender task so they stay in order and no
+        # send is left as an unreferenced task
+        outgoing: asyncio.Queue = asyncio.Queue()
+
+        async def send_output() -> None:
             try:
-                while proc.poll() is None:
-                    r, _, _ = await loop.run_in_executor(
-                        None, select.select, [master_fd], [], [], 0.1
-                    )
-                    if master_fd in r:
-                        data = os.read(master_fd, 4096)
-                        if data:
-                            await ws.send_text(data.decode("utf-8", errors="replace"))
-            except Exception:
+                while True:
+                    await ws.send_text(await outgoing.get())
+            except (WebSocketDisconnect, RuntimeError, OSError):
+                # Client went away; the receive loop below notices it too
                 pass
 
-        reader_task = asyncio.create_task(reader())
+        def flush_output(final: bool = False) -> None:
+            nonlocal flush_handle
+            if flush_handle is not None:
+                flush_handle.cancel()
+                flush_handle = None
+            text = decoder.decode(pending, final=final)
+            pending.clear()
+            if text:
+                outgoing.put_nowait(text)
+
+        def on_readable() -> None:
+            nonlocal flush_handle
+            try:
+                size = os.readv(master_fd, [read_buf])
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # EIO once the shell exits and the slave side is gone
+                size = 0
+            if not size:
+                loop.remove_reader(master_fd)
+                flush_output(final=True)
+                return
+
+            pending.extend(read_view[:size])
+            if len(pending) >= PTY_MAX_PENDING:
+                flush_output()
+            elif flush_handle is None:
+                flush_handle = loop.call_later(PTY_COALESCE_DELAY, flush_output)
+
+        async def write_input(data: bytes) -> None:
+            while data:
+                try:
+                    written = os.write(master_fd, data)
+                    data = data[written:]
+                except BlockingIOError:
+                    writable = loop.create_future()
+                    # The writer may fire again before this task removes it
+                    loop.add_writer(master_fd, lambda: writable.done() or writable.set_result(None))
+                    try:
+                        await writable
+                    finally:
+                        loop.remove_writer(master_fd)
+
+        sender = asyncio.create_task(send_output())
+        loop.add_reader(master_fd, on_readable)
 
         try:
             while True:
                 data = await ws.receive_text()
-                os.write(master_fd, data.encode("utf-8"))
+                await write_input(data.encode("utf-8"))
         except WebSocketDisconnect:
             pass
         finally:
-            reader_task.cancel()
+            loop.remove_reader(master_fd)
+            if flush_handle is not None:
+                flush_handle.cancel()
+            sender.cancel()
             proc.terminate()
             os.close(master_fd)
 
     # ---- Optionally serve built Svelte frontend -------------------------
 
-    dist_dir = Path(__file__).parent.parent.parent / "ui" / "dist"
-    if dist_dir.exists():
-        app.mount("/", StaticFiles(directory=str(dist_dir), html=True), name="frontend")
+    if DIST_DIR_EXISTS:
+        app.mount("/", StaticFiles(directory=str(DIST_DIR), html=True), name="frontend")
 
     return app
 
@@ -352,4 +704,8 @@ if __name__ == "__main__":
         port=8745,
         reload=False,
         log_level="info",
+        # "auto" selects uvloop and httptools, installed via uvicorn[standard]
+        loop="auto",
+        http="auto",
+        access_log=False,
     )
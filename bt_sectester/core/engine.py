@@ -4,24 +4,60 @@ Main engine/coordinator for bt-sec-analyzer.
 Orchestrates scanning, attacks, reporting, and UI interactions.
 """
 
+import atexit
+import copy
+import logging
 import signal
-import sys
+import threading
+import time
+from collections import OrderedDict
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
-from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-from bt_sectester.modules.ai.ollama_client import OllamaClient
 from bt_sectester.modules.scanning.bluetooth_scanner import BluetoothScanner
+from bt_sectester.utils import fastjson
 from bt_sectester.utils.config import Config
-from bt_sectester.utils.helpers import ensure_directory
+from bt_sectester.utils.helpers import (
+    atomic_write_bytes,
+    ensure_directory,
+    normalize_mac_address,
+)
 from bt_sectester.utils.logger import AuditLogger, LoggerMixin, setup_logger
 from bt_sectester.utils.privileges import PrivilegeManager
 
+if TYPE_CHECKING:
+    from bt_sectester.modules.ai.ollama_client import OllamaClient
+
 
 class BTSecEngine(LoggerMixin):
     """Main engine coordinating all bt-sec-analyzer operations."""
 
+    __slots__ = (
+        "_audit_offset",
+        "_io_pool",
+        "_io_workers",
+        "_is_shutdown",
+        "_max_processes",
+        "_ollama_client",
+        "_ollama_enabled",
+        "_ollama_lock",
+        "_pool_lock",
+        "_previous_signal_handlers",
+        "_process_pool",
+        "_shutdown_requested",
+        "_svc_cache",
+        "_svc_cache_lock",
+        "_svc_cache_size",
+        "_svc_cache_ttl",
+        "audit_logger",
+        "config",
+        "privilege_manager",
+        "scanner",
+        "session_data",
+        "session_id",
+    )
+
     def __init__(self, config: Optional[Config] = None):
         """
         Initialize bt-sec-analyzer engine.
@@ -30,15 +66,20 @@ class BTSecEngine(LoggerMixin):
             config: Configuration object (loads default if None)
         """
         self.config = config or Config.load()
+        self._is_shutdown = False
+        self._shutdown_requested = False
+        self._previous_signal_handlers: Dict[int, Any] = {}
         self._setup_logging()
         self._setup_directories()
         self._setup_components()
         self._setup_signal_handlers()
 
-        self.session_id = self._generate_session_id()
+        # Kept as integer nanoseconds; formatted only when a report is rendered
+        start_time_ns = time.time_ns()
+        self.session_id = self._generate_session_id(start_time_ns)
         self.session_data: Dict[str, Any] = {
             "session_id": self.session_id,
-            "start_time": datetime.utcnow().isoformat(),
+            "start_time_ns": start_time_ns,
             "devices": [],
             "attacks": [],
             "logs": [],
@@ -77,8 +118,11 @@ class BTSecEngine(LoggerMixin):
         if log_config.audit.get("enabled", True):
             audit_file = Path(log_config.audit.get("file_path", "logs/audit.json"))
             self.audit_logger = AuditLogger(audit_file)
+            # Entries past this offset belong to this session
+            self._audit_offset = self.audit_logger.size()
         else:
             self.audit_logger = None
+            self._audit_offset = 0
 
     def _setup_directories(self) -> None:
         """Create necessary directories."""
@@ -103,60 +147,144 @@ class BTSecEngine(LoggerMixin):
         # Check Bluetooth permissions
         self.privilege_manager.check_bluetooth_permissions()
 
-        # Thread and process pools
-        max_workers = self.config.performance.get("max_workers", 8)
-        max_processes = self.config.performance.get("max_processes", 4)
-
-        self.thread_pool = ThreadPoolExecutor(max_workers=max_workers)
-        self.process_pool = ProcessPoolExecutor(max_workers=max_processes)
+        # I/O thread pool (Bluetooth/HCI waits, Ollama HTTP) and CPU process
+        # pool (report rendering, capture analysis), created on first use so
+        # long compute jobs never queue ahead of short I/O waits
+        self._io_workers = self.config.performance.get(
+            "io_workers", self.config.performance.get("max_workers", 32)
+        )
+        self._max_processes = self.config.performance.get("max_processes", 4)
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+        # Service enumeration cache: MAC -> (monotonic timestamp, result), LRU ordered
+        self._svc_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._svc_cache_ttl = self.config.performance.get("svc_cache_ttl", 60)
+        self._svc_cache_size = self.config.performance.get("svc_cache_size", 256)
+        # The API enumerates from several worker threads at once
+        self._svc_cache_lock = threading.Lock()
 
         # Scanner
         self.scanner = BluetoothScanner(
             adapter=self.config.bluetooth.default_adapter,
             privilege_manager=self.privilege_manager,
+            executor=self.io_pool,
+            max_devices=self.config.bluetooth.max_devices,
         )
 
-        # Ollama client (if enabled)
-        if self.config.ollama.enabled:
-            try:
-                self.ollama_client = OllamaClient(
-                    host=self.config.ollama.host,
-                    model=self.config.ollama.model,
-                    timeout=self.config.ollama.timeout,
-                )
-                self.logger.info("Ollama client initialized")
-            except Exception as e:
-                self.logger.warning("Failed to initialize Ollama client", error=str(e))
-                self.ollama_client = None
-        else:
-            self.ollama_client = None
+        # Ollama client (if enabled), connected on first use
+        self._ollama_enabled = self.config.ollama.enabled
+        self._ollama_client: Optional["OllamaClient"] = None
+        self._ollama_lock = threading.Lock()
+
+    @property
+    def io_pool(self) -> ThreadPoolExecutor:
+        """Thread pool for I/O-bound work, created on first access."""
+        if self._io_pool is None:
+            with self._pool_lock:
+                if self._io_pool is None:
+                    self._io_pool = ThreadPoolExecutor(
+                        max_workers=self._io_workers, thread_name_prefix="bt-io"
+                    )
+        return self._io_pool
+
+    @property
+    def ollama_client(self) -> Optional["OllamaClient"]:
+        """
+        Ollama client, created and connected on first access.
+
+        Scan-only runs never touch it, so they skip importing the ollama
+        library and probing the server.
+
+        Returns:
+            Client instance, or None if Ollama is disabled or unreachable
+        """
+        if self._ollama_client is None and self._ollama_enabled:
+            with self._ollama_lock:
+                if self._ollama_client is None and self._ollama_enabled:
+                    from bt_sectester.modules.ai.ollama_client import OllamaClient
+
+                    try:
+                        self._ollama_client = OllamaClient(
+                            host=self.config.ollama.host,
+                            model=self.config.ollama.model,
+                            timeout=self.config.ollama.timeout,
+                            executor=self.io_pool,
+                        )
+                        self.logger.info("Ollama client initialized")
+                    except Exception as e:
+                        self.logger.warning("Failed to initialize Ollama client", error=str(e))
+                        # Don't retry the probe on every access
+                        self._ollama_enabled = False
+        return self._ollama_client
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        """Process pool for CPU-bound work, created on first access."""
+        if self._process_pool is None:
+            with self._pool_lock:
+                if self._process_pool is None:
+                    self._process_pool = ProcessPoolExecutor(max_workers=self._max_processes)
+        return self._process_pool
 
     def _setup_signal_handlers(self) -> None:
         """Setup signal handlers for graceful shutdown."""
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        # signal.signal only works in the main thread; embedded engines
+        # (e.g. built by the API server's worker threads) are shut down by
+        # the host, as the API server does on its shutdown event
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self._previous_signal_handlers[signum] = signal.signal(signum, self._signal_handler)
+
+        # The actual shutdown runs here, in normal context, once the
+        # signal handler has unwound the interrupted code
+        atexit.register(self.shutdown)
+
+    def _restore_signal_handlers(self) -> None:
+        """Reinstall the signal handlers that were active before the engine."""
+        for signum, handler in self._previous_signal_handlers.items():
+            signal.signal(signum, handler if handler is not None else signal.SIG_DFL)
+        self._previous_signal_handlers.clear()
 
     def _signal_handler(self, signum: int, frame: Any) -> None:
         """
         Handle shutdown signals.
 
+        Only records the request and exits the interrupted code. Saving the
+        session and joining the pools would take locks the interrupted code
+        may already hold, so shutdown() is left to the atexit hook.
+
         Args:
             signum: Signal number
             frame: Current stack frame
         """
-        self.logger.warning("Received shutdown signal", signal=signum)
-        self.shutdown()
-        sys.exit(0)
+        self._shutdown_requested = True
+        raise SystemExit(0)
 
-    def _generate_session_id(self) -> str:
+    @property
+    def shutdown_requested(self) -> bool:
+        """Whether a shutdown signal has been received."""
+        return self._shutdown_requested
+
+    def _generate_session_id(self, start_time_ns: int) -> str:
         """
         Generate unique session ID.
 
+        Microseconds are included so engines created within the same
+        second get distinct IDs.
+
+        Args:
+            start_time_ns: Session start in nanoseconds since the epoch
+
         Returns:
             Session ID string
         """
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        return f"session_{timestamp}"
+        seconds, nanoseconds = divmod(start_time_ns, 1_000_000_000)
+        prefix = time.strftime("session_%Y%m%d_%H%M%S_", time.gmtime(seconds))
+        return f"{prefix}{nanoseconds // 1000:06d}"
 
     def scan_devices(
         self,
@@ -175,12 +303,16 @@ class BTSecEngine(LoggerMixin):
         Returns:
             List of discovered devices
         """
-        self.logger.info("Starting device scan", classic=classic, ble=ble, duration=duration)
+        logger = self.logger
+        audit = self.audit_logger
+        ethical_mode = self.config.app.ethical_mode
 
-        self.audit_logger.log_action(
+        logger.info("Starting device scan", classic=classic, ble=ble, duration=duration)
+
+        audit.log_action(
             "scan_started",
             details={"classic": classic, "ble": ble, "duration": duration},
-            ethical_mode=self.config.app.ethical_mode,
+            ethical_mode=ethical_mode,
         )
 
         try:
@@ -192,47 +324,77 @@ class BTSecEngine(LoggerMixin):
 
             self.session_data["devices"].extend(devices)
 
-            self.logger.info("Scan completed", device_count=len(devices))
+            logger.info("Scan completed", device_count=len(devices))
 
-            self.audit_logger.log_action(
+            audit.log_action(
                 "scan_completed",
                 details={"device_count": len(devices)},
-                ethical_mode=self.config.app.ethical_mode,
+                ethical_mode=ethical_mode,
             )
 
             return devices
 
         except Exception as e:
-            self.logger.error("Scan failed", error=str(e))
+            logger.error("Scan failed", error=str(e))
             raise
 
     def enumerate_services(self, mac_address: str) -> Dict[str, Any]:
         """
         Enumerate services for a specific device.
 
+        Results are cached per MAC for performance.svc_cache_ttl seconds.
+
         Args:
             mac_address: Target device MAC address
 
         Returns:
             Service information dictionary
         """
-        self.logger.info("Enumerating services", mac=mac_address)
+        logger = self.logger
+        audit = self.audit_logger
+        ethical_mode = self.config.app.ethical_mode
 
-        self.audit_logger.log_action(
+        logger.info("Enumerating services", mac=mac_address)
+
+        audit.log_action(
             "enumerate_services",
             details={"mac": mac_address},
-            ethical_mode=self.config.app.ethical_mode,
+            ethical_mode=ethical_mode,
         )
 
+        cache_key = normalize_mac_address(mac_address)
+        with self._svc_cache_lock:
+            cached = self._svc_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < self._svc_cache_ttl:
+                self._svc_cache.move_to_end(cache_key)
+            else:
+                cached = None
+        if cached is not None:
+            logger.debug("Using cached service enumeration", mac=mac_address)
+            # Callers get their own copy so they cannot alter the cached entry
+            return copy.deepcopy(cached[1])
+
         try:
             services = self.scanner.enumerate_services(mac_address)
 
-            self.logger.info("Service enumeration completed", mac=mac_address, service_count=len(services.get("services", [])))
+            if logger.is_enabled_for(logging.INFO):
+                logger.info(
+                    "Service enumeration completed",
+                    mac=mac_address,
+                    service_count=len(services.get("services", [])),
+                )
+
+            entry = (time.monotonic(), copy.deepcopy(services))
+            with self._svc_cache_lock:
+                self._svc_cache[cache_key] = entry
+                self._svc_cache.move_to_end(cache_key)
+                while len(self._svc_cache) > self._svc_cache_size:
+                    self._svc_cache.popitem(last=False)
 
             return services
 
         except Exception as e:
-            self.logger.error("Service enumeration failed", mac=mac_address, error=str(e))
+            logger.error("Service enumeration failed", mac=mac_address, error=str(e))
             raise
 
     def save_session(self, filepath: Optional[Path] = None) -> Path:
@@ -250,27 +412,75 @@ class BTSecEngine(LoggerMixin):
 
         ensure_directory(filepath.parent)
 
-        import json
-
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(self.session_data, f, indent=2)
+        atomic_write_bytes(filepath, fastjson.dumps(self.session_data, indent=True))
 
         self.logger.info("Session saved", filepath=str(filepath))
         return filepath
 
+    def export_session(self, filepath: Optional[Path] = None) -> Path:
+        """
+        Export session data together with this session's audit trail.
+
+        Audit entries are streamed from the JSON-lines audit file straight
+        into the output, without loading or re-encoding them.
+
+        Args:
+            filepath: Optional custom export path
+
+        Returns:
+            Path to exported session file
+        """
+        if filepath is None:
+            filepath = Path("sessions") / f"{self.session_id}_export.json"
+
+        ensure_directory(filepath.parent)
+
+        with open(filepath, "wb") as f:
+            # session_data is a non-empty dict; reopen it to append the audit list
+            f.write(fastjson.dumps(self.session_data)[:-1])
+            f.write(b', "audit": [')
+            if self.audit_logger:
+                for index, line in enumerate(
+                    self.audit_logger.iter_raw_entries(self._audit_offset)
+                ):
+                    if index:
+                        f.write(b",")
+                    f.write(line)
+            f.write(b"]}")
+
+        self.logger.info("Session exported", filepath=str(filepath))
+        return filepath
+
     def shutdown(self) -> None:
-        """Gracefully shutdown the engine."""
-        self.logger.info("Shutting down bt-sec-analyzer engine")
+        """Gracefully shutdown the engine. Subsequent calls are no-ops."""
+        if self._is_shutdown:
+            return
+        self._is_shutdown = True
+
+        logger = self.logger
+        logger.info(
+            "Shutting down bt-sec-analyzer engine",
+            signal_requested=self._shutdown_requested,
+        )
+
+        if threading.current_thread() is threading.main_thread():
+            self._restore_signal_handlers()
 
         # Save session
         try:
             self.save_session()
         except Exception as e:
-            self.logger.error("Failed to save session", error=str(e))
+            logger.error("Failed to save session", error=str(e))
+
+        # Stop the scanner's event loop before the pool its classic scans use
+        self.scanner.close()
+        self.privilege_manager.close()
 
-        # Shutdown thread and process pools
-        self.thread_pool.shutdown(wait=True)
-        self.process_pool.shutdown(wait=True)
+        # Shutdown thread and process pools that were actually started
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True)
 
         # Log audit entry
         if self.audit_logger:
@@ -279,5 +489,6 @@ class BTSecEngine(LoggerMixin):
                 details={"session_id": self.session_id},
                 ethical_mode=self.config.app.ethical_mode,
             )
+            self.audit_logger.close()
 
-        self.logger.info("Shutdown complete")
+        logger.info("Shutdown complete")
@@ -4,26 +4,55 @@ Ollama client for local LLM integration.
 Provides log summarization and analysis using locally-running Qwen Coder.
 """
 
-import json
-from typing import Any, Dict, List, Optional
+import hashlib
+import logging
+import re
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Union
 
 try:
     import ollama
 except ImportError:
     ollama = None
 
+from bt_sectester.utils import fastjson
 from bt_sectester.utils.logger import LoggerMixin
 
+# Successful connection probes are remembered here so short-lived CLI
+# invocations can skip the round-trip to the server
+CONNECTION_CACHE_DIR = Path("~/.cache/bt_sectester").expanduser()
+CONNECTION_CACHE_TTL = 300
+
+# Bound once so each log line is a single format call
+_format_log_line = "[{}] {}".format
+
+# Leading list marker of an insight line, e.g. "1. ", "2) ", "- ", "• "
+_INSIGHT_PREFIX = re.compile(r"\s*[0-9\-•][0-9.\-•) ]*")
+
 
 class OllamaClient(LoggerMixin):
 
     """Client for Ollama local LLM service."""
 
+    __slots__ = (
+        "_client",
+        "_connection_marker",
+        "_executor",
+        "_warmup_future",
+        "host",
+        "model",
+        "timeout",
+    )
+
     def __init__(
         self,
         host: str = "http://localhost:11434",
         model: str = "qwen2.5-coder:7b",
         timeout: int = 60,
+        executor: Optional[Executor] = None,
+        warmup: bool = True,
     ):
         """
         Initialize Ollama client.
@@ -32,6 +61,9 @@ class OllamaClient(LoggerMixin):
             host: Ollama server host
             model: Model name to use
             timeout: Request timeout in seconds
+            executor: Executor for concurrent batch requests (created on demand if None)
+            warmup: Load the model in the background so the first real
+                request does not pay the cold-start cost
 
         Raises:
             RuntimeError: If Ollama library not available
@@ -42,16 +74,82 @@ class OllamaClient(LoggerMixin):
         self.host = host
         self.model = model
         self.timeout = timeout
+        self._executor = executor
+
+        # One client (and connection pool) reused for every request
+        self._client = ollama.Client(host=self.host, timeout=self.timeout)
+
+        cache_key = hashlib.sha1(f"{self.host}|{self.model}".encode()).hexdigest()
+        self._connection_marker = CONNECTION_CACHE_DIR / f"{cache_key}.ok"
 
         # Test connection
         self._test_connection()
 
+        self._warmup_future: Optional[Future] = None
+        if warmup:
+            self._warmup_future = self._get_executor().submit(self._warmup)
+
+    def _get_executor(self) -> Executor:
+        """Get the executor, creating a private one on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=4)
+        return self._executor
+
+    def _warmup(self) -> bool:
+        """
+        Load the model with a one-token request and keep it resident.
+
+        Returns:
+            True if the model responded
+        """
+        try:
+            self._client.generate(
+                model=self.model,
+                prompt=" ",
+                options={"num_predict": 1},
+                keep_alive="10m",
+            )
+            self.logger.debug("Ollama model warmed up", model=self.model)
+            return True
+        except Exception as e:
+            self.logger.warning("Ollama model warmup failed", model=self.model, error=str(e))
+            return False
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the background model warmup to finish.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the model is loaded, False if warmup failed, timed out
+            or was disabled
+        """
+        if self._warmup_future is None:
+            return False
+        try:
+            return self._warmup_future.result(timeout=timeout)
+        except Exception:
+            return False
+
     def _test_connection(self) -> None:
-        """Test connection to Ollama server."""
+        """
+        Test connection to Ollama server.
+
+        Skipped if the same host and model were validated within
+        CONNECTION_CACHE_TTL seconds.
+        """
+        try:
+            if time.time() - self._connection_marker.stat().st_mtime < CONNECTION_CACHE_TTL:
+                self.logger.debug("Ollama connection recently validated", host=self.host)
+                return
+        except OSError:
+            pass
+
         try:
             # Try to list models to verify connection
-            client = ollama.Client(host=self.host)
-            models = client.list()
+            models = self._client.list()
             self.logger.info(
                 "Connected to Ollama",
                 host=self.host,
@@ -61,29 +159,82 @@ class OllamaClient(LoggerMixin):
             self.logger.error("Failed to connect to Ollama", error=str(e), host=self.host)
             raise RuntimeError(f"Cannot connect to Ollama at {self.host}: {e}") from e
 
+        try:
+            self._connection_marker.parent.mkdir(parents=True, exist_ok=True)
+            self._connection_marker.touch()
+        except OSError:
+            pass
+
+    def _invalidate_connection(self) -> None:
+        """Forget a cached connection probe so the next client re-checks."""
+        try:
+            self._connection_marker.unlink(missing_ok=True)
+        except OSError:
+            pass
+
     def summarize_logs(
         self,
-        logs: List[Dict[str, Any]],
+        logs: Union[List[Dict[str, Any]], bytes],
         context: Optional[str] = None,
+        output: Optional[TextIO] = None,
     ) -> str:
         """
         Summarize log entries using LLM.
 
         Args:
-            logs: List of log entry dictionaries
+            logs: List of log entry dictionaries, or preformatted log lines
+                (e.g. AuditLogger.formatted_bytes())
             context: Optional context about the operation
+            output: Optional stream that receives the summary as tokens arrive
 
         Returns:
             Summary text
         """
-        self.logger.debug("Summarizing logs", log_count=len(logs))
+        if self.logger.is_enabled_for(logging.DEBUG):
+            log_count = logs.count(b"\n") if isinstance(logs, bytes) else len(logs)
+            self.logger.debug("Summarizing logs", log_count=log_count)
+
+        prompt = self._summary_prompt(logs, context)
+
+        try:
+            if output is None:
+                response = self._generate(prompt)
+            else:
+                parts = []
+                for chunk in self._generate_stream(prompt):
+                    output.write(chunk)
+                    parts.append(chunk)
+                output.flush()
+                response = "".join(parts)
+
+            self.logger.info("Log summarization complete")
+            return response
+        except Exception as e:
+            self.logger.error("Log summarization failed", error=str(e))
+            raise
+
+    def _summary_prompt(
+        self, logs: Union[List[Dict[str, Any]], bytes], context: Optional[str]
+    ) -> str:
+        """
+        Build the log summarization prompt.
+
+        Args:
+            logs: List of log entry dictionaries, or preformatted log lines
+            context: Optional context about the operation
 
+        Returns:
+            Prompt text
+        """
         # Prepare log data for the model
-        log_text = "\n".join(
-            [f"[{log.get('timestamp', 'N/A')}] {log.get('event', log)}" for log in logs]
-        )
+        if isinstance(logs, bytes):
+            log_text = logs.decode("utf-8", "replace").rstrip("\n")
+        else:
+            log_text = "\n".join(
+                _format_log_line(log.get("timestamp", "N/A"), log.get("event", log)) for log in logs
+            )
 
-        prompt = f"""You are a security analyst reviewing Bluetooth security testing logs.
+        return f"""You are a security analyst reviewing Bluetooth security testing logs.
 
 Context: {context or 'Bluetooth security assessment'}
 
@@ -98,14 +249,6 @@ Please provide a concise summary of these logs, highlighting:
 
 Summary:"""
 
-        try:
-            response = self._generate(prompt)
-            self.logger.info("Log summarization complete")
-            return response
-        except Exception as e:
-            self.logger.error("Log summarization failed", error=str(e))
-            raise
-
     def analyze_attack_results(
         self,
         attack_type: str,
@@ -123,9 +266,49 @@ Summary:"""
         """
         self.logger.debug("Analyzing attack results", attack_type=attack_type)
 
-        results_json = json.dumps(results, indent=2)
+        prompt = self._attack_analysis_prompt(attack_type, results)
 
-        prompt = f"""You are a security analyst reviewing results from a Bluetooth security test.
+        try:
+            response = self._generate(prompt)
+            self.logger.info("Attack analysis complete", attack_type=attack_type)
+            return response
+        except Exception as e:
+            self.logger.error("Attack analysis failed", attack_type=attack_type, error=str(e))
+            raise
+
+    def analyze_attacks(self, attacks: List[Dict[str, Any]]) -> List[str]:
+        """
+        Analyze several attack results concurrently.
+
+        Args:
+            attacks: Attack result dictionaries (as produced by AttackResult.to_dict)
+
+        Returns:
+            Analysis text for each attack, in input order
+        """
+        if self.logger.is_enabled_for(logging.DEBUG):
+            self.logger.debug("Analyzing attack results in batch", attack_count=len(attacks))
+
+        prompts = [
+            self._attack_analysis_prompt(attack.get("attack_type", "unknown"), attack)
+            for attack in attacks
+        ]
+        return self.generate_batch(prompts)
+
+    def _attack_analysis_prompt(self, attack_type: str, results: Dict[str, Any]) -> str:
+        """
+        Build the prompt used to analyze one attack result.
+
+        Args:
+            attack_type: Type of attack
+            results: Attack results dictionary
+
+        Returns:
+            Prompt text
+        """
+        results_json = fastjson.dumps(results, indent=True).decode("utf-8")
+
+        return f"""You are a security analyst reviewing results from a Bluetooth security test.
 
 Attack Type: {attack_type}
 
@@ -141,14 +324,6 @@ Please provide a professional analysis including:
 
 Analysis:"""
 
-        try:
-            response = self._generate(prompt)
-            self.logger.info("Attack analysis complete", attack_type=attack_type)
-            return response
-        except Exception as e:
-            self.logger.error("Attack analysis failed", attack_type=attack_type, error=str(e))
-            raise
-
     def extract_key_insights(
         self,
         text: str,
@@ -175,17 +350,18 @@ Key insights:"""
         try:
             response = self._generate(prompt)
 
-            # Parse numbered list
+            # Parse numbered/bulleted list items, dropping the marker
             insights = []
-            for line in response.split("\n"):
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith("-") or line.startswith("•")):
-                    # Remove numbering
-                    insight = line.lstrip("0123456789.-•) ").strip()
+            for line in response.splitlines():
+                match = _INSIGHT_PREFIX.match(line)
+                if match:
+                    insight = line[match.end() :].strip()
                     if insight:
                         insights.append(insight)
+                        if len(insights) == max_insights:
+                            break
 
-            return insights[:max_insights]
+            return insights
 
         except Exception as e:
             self.logger.error("Insight extraction failed", error=str(e))
@@ -203,9 +379,7 @@ Key insights:"""
             Generated text
         """
         try:
-            client = ollama.Client(host=self.host)
-
-            response = client.generate(
+            response = self._client.generate(
                 model=self.model,
                 prompt=prompt,
                 stream=stream,
@@ -213,17 +387,48 @@ Key insights:"""
 
             if stream:
                 # Handle streaming response
-                full_response = ""
-                for chunk in response:
-                    full_response += chunk.get("response", "")
-                return full_response
+                return "".join(chunk.get("response", "") for chunk in response)
             else:
                 return response.get("response", "")
 
         except Exception as e:
             self.logger.error("LLM generation failed", error=str(e))
+            self._invalidate_connection()
+            raise
+
+    def _generate_stream(self, prompt: str) -> Iterator[str]:
+        """
+        Generate text using the LLM, yielding chunks as they arrive.
+
+        Args:
+            prompt: Input prompt
+
+        Yields:
+            Response text chunks
+        """
+        try:
+            for chunk in self._client.generate(model=self.model, prompt=prompt, stream=True):
+                yield chunk.get("response", "")
+        except Exception as e:
+            self.logger.error("LLM generation failed", error=str(e))
+            self._invalidate_connection()
             raise
 
+    def generate_batch(self, prompts: List[str]) -> List[str]:
+        """
+        Generate responses for several prompts concurrently.
+
+        Requests overlap on the executor, so N prompts take roughly
+        ceil(N / workers) round-trips instead of N.
+
+        Args:
+            prompts: Input prompts
+
+        Returns:
+            Generated text for each prompt, in input order
+        """
+        return list(self._get_executor().map(self._generate, prompts))
+
     def chat(
         self,
         messages: List[Dict[str, str]],
@@ -238,9 +443,7 @@ Key insights:"""
             Response text
         """
         try:
-            client = ollama.Client(host=self.host)
-
-            response = client.chat(
+            response = self._client.chat(
                 model=self.model,
                 messages=messages,
             )
@@ -249,4 +452,5 @@ Key insights:"""
 
         except Exception as e:
             self.logger.error("Chat failed", error=str(e))
+            self._invalidate_connection()
             raise
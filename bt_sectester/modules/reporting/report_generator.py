@@ -4,30 +4,378 @@ Report generator for creating professional security assessment reports.
 Generates PDF and HTML reports from session data.
 """
 
+import heapq
+import io
+import queue
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.lib.units import inch
-from reportlab.platypus import (
-    PageBreak,
-    Paragraph,
-    SimpleDocTemplate,
-    Spacer,
-    Table,
-    TableStyle,
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from bt_sectester.utils.helpers import (
+    atomic_write_bytes,
+    ensure_directory,
+    format_timestamp_ns,
+    sanitize_filename,
 )
-
-from bt_sectester.utils.helpers import ensure_directory, sanitize_filename
 from bt_sectester.utils.logger import LoggerMixin
 
+if TYPE_CHECKING:
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.platypus import Flowable, TableStyle
+
+
+# In-memory PDF buffers kept per generator for reuse
+PDF_BUFFER_POOL_SIZE = 4
+
+# Devices listed in a report's device table (strongest signal first)
+REPORT_DEVICE_LIMIT = 20
+
+RECOMMENDATIONS = (
+    "Ensure all Bluetooth devices use strong PINs (6+ digits) and authentication.",
+    "Disable Bluetooth when not in use to reduce attack surface.",
+    "Keep device firmware updated to patch known vulnerabilities.",
+    "Use Bluetooth 5.0+ with enhanced security features.",
+    "Implement proper encryption for sensitive data transmission.",
+    "Monitor for unauthorized Bluetooth devices in the environment.",
+)
+
+DISCLAIMER = """
+<b>Disclaimer:</b> This report is provided for authorized security testing purposes only.
+All tests were conducted with proper authorization. The findings represent potential
+vulnerabilities identified during the assessment period and should be addressed according
+to organizational risk management policies.
+"""
+
+
+@lru_cache(maxsize=1)
+def _rl() -> SimpleNamespace:
+    """
+    Import the ReportLab names used for PDF output.
+
+    ReportLab is only loaded on the first PDF report, so HTML reports and
+    other importers of this module do not pay for it.
+
+    Returns:
+        Namespace of ReportLab classes and constants
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import (
+        PageBreak,
+        Paragraph,
+        SimpleDocTemplate,
+        Spacer,
+        Table,
+        TableStyle,
+    )
+
+    return SimpleNamespace(
+        colors=colors,
+        letter=letter,
+        ParagraphStyle=ParagraphStyle,
+        getSampleStyleSheet=getSampleStyleSheet,
+        inch=inch,
+        PageBreak=PageBreak,
+        Paragraph=Paragraph,
+        SimpleDocTemplate=SimpleDocTemplate,
+        Spacer=Spacer,
+        Table=Table,
+        TableStyle=TableStyle,
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_styles() -> Dict[str, "ParagraphStyle"]:
+    """
+    Build the paragraph styles used by PDF reports.
+
+    getSampleStyleSheet constructs a fresh set of styles on every call, so
+    the result is built once per process and shared across reports.
+
+    Returns:
+        Mapping of style name to ParagraphStyle
+    """
+    rl = _rl()
+    sample = rl.getSampleStyleSheet()
+    styles = {name: sample[name] for name in ("Heading2", "Heading3", "BodyText")}
+    styles["CustomTitle"] = rl.ParagraphStyle(
+        "CustomTitle",
+        parent=sample["Heading1"],
+        fontSize=24,
+        textColor=rl.colors.HexColor("#1a1a1a"),
+        spaceAfter=30,
+    )
+    return styles
+
+
+@lru_cache(maxsize=1)
+def _get_table_styles() -> Dict[str, "TableStyle"]:
+    """
+    Build the table styles used by PDF reports.
+
+    A TableStyle is only read when applied to a Table, so one instance per
+    kind is shared by every table in every report.
+
+    Returns:
+        Mapping of table kind (metadata, device, attack) to TableStyle
+    """
+    rl = _rl()
+    colors = rl.colors
+    TableStyle = rl.TableStyle
+    return {
+        "metadata": TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (0, -1), colors.lightgrey),
+                ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, -1), 10),
+                ("GRID", (0, 0), (-1, -1), 1, colors.black),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ]
+        ),
+        "device": TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, -1), 9),
+                ("GRID", (0, 0), (-1, -1), 1, colors.black),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            ]
+        ),
+        "attack": TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (0, -1), colors.lightgrey),
+                ("GRID", (0, 0), (-1, -1), 1, colors.black),
+                ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, -1), 9),
+            ]
+        ),
+    }
+
+
+@lru_cache(maxsize=1)
+def _get_closing_flowables() -> Tuple["Flowable", ...]:
+    """
+    Build the recommendations and disclaimer that close every PDF report.
+
+    The text never changes, so the flowables are built once and shared by
+    every report's story.
+
+    Returns:
+        Recommendation bullets followed by the disclaimer
+    """
+    rl = _rl()
+    body = _get_styles()["BodyText"]
+    spacer = rl.Spacer(1, 0.1 * rl.inch)
+    flowables: List[Any] = []
+    for rec in RECOMMENDATIONS:
+        flowables.append(rl.Paragraph(f"• {rec}", body))
+        flowables.append(spacer)
+    flowables.append(rl.Spacer(1, 0.3 * rl.inch))
+    flowables.append(rl.Paragraph(DISCLAIMER, body))
+    return tuple(flowables)
+
+
+# Single-pass HTML escaping for values interpolated into the report
+_HTML_ESCAPE_TABLE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+
+
+def _escape_html(value: Any) -> str:
+    """
+    Escape a value for safe inclusion in HTML text or attributes.
+
+    Args:
+        value: Value to escape (converted with str())
+
+    Returns:
+        Escaped string
+    """
+    return str(value).translate(_HTML_ESCAPE_TABLE)
+
+
+# HTML report fragments, assembled with a single join per report
+_HTML_HEAD = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Bluetooth Security Assessment Report</title>
+    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        h1 {
+            color: #1a1a1a;
+            border-bottom: 3px solid #007bff;
+            padding-bottom: 10px;
+        }
+        h2 {
+            color: #333;
+            margin-top: 30px;
+        }
+        .metadata {
+            background-color: white;
+            padding: 20px;
+            border-radius: 5px;
+            margin-bottom: 20px;
+        }
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            background-color: white;
+            margin-bottom: 20px;
+        }
+        th, td {
+            padding: 12px;
+            text-align: left;
+            border-bottom: 1px solid #ddd;
+        }
+        th {
+            background-color: #007bff;
+            color: white;
+        }
+        .status-success {
+            color: #28a745;
+            font-weight: bold;
+        }
+        .status-failed {
+            color: #dc3545;
+            font-weight: bold;
+        }
+    </style>
+</head>
+<body>
+    <h1>Bluetooth Security Assessment Report</h1>
+"""
+
+_HTML_METADATA = """
+    <div class="metadata">
+        <p><strong>Session ID:</strong> {session_id}</p>
+        <p><strong>Date:</strong> {start_time}</p>
+        <p><strong>Company:</strong> {company}</p>
+        <p><strong>Generated:</strong> {generated}</p>
+    </div>
+
+    <h2>Discovered Devices ({device_count})</h2>
+    <table>
+        <thead>
+            <tr>
+                <th>MAC Address</th>
+                <th>Name</th>
+                <th>Type</th>
+                <th>Signal (RSSI)</th>
+            </tr>
+        </thead>
+        <tbody>
+""".format
+
+_HTML_DEVICE_ROW = """
+            <tr>
+                <td>{mac}</td>
+                <td>{name}</td>
+                <td>{type}</td>
+                <td>{rssi} dBm</td>
+            </tr>
+""".format
+
+_HTML_ATTACKS_HEADER = """
+        </tbody>
+    </table>
+
+    <h2>Security Simulations</h2>
+"""
+
+_HTML_ATTACK = """
+    <div class="metadata">
+        <h3>{attack_type}</h3>
+        <p><strong>Target:</strong> {target}</p>
+        <p><strong>Status:</strong> <span class="{status_class}">{status}</span></p>
+        <p><strong>Duration:</strong> {duration:.2f} seconds</p>
+    </div>
+""".format
+
+_HTML_TAIL = """
+</body>
+</html>
+"""
+
+
+def _session_start(session_data: Dict[str, Any], default: str) -> str:
+    """
+    Get the display start time of a session.
+
+    Args:
+        session_data: Session data dictionary
+        default: Value to use when the session has no start time
+
+    Returns:
+        ISO 8601 start time
+    """
+    if "start_time_ns" in session_data:
+        return format_timestamp_ns(session_data["start_time_ns"])
+    # Sessions saved by older versions store a preformatted string
+    return session_data.get("start_time", default)
+
+
+def _rssi_key(device: Dict[str, Any]) -> float:
+    """Sort key placing devices without a signal reading last."""
+    rssi = device.get("rssi")
+    return rssi if isinstance(rssi, (int, float)) else float("-inf")
+
+
+def _top_devices(
+    devices: List[Dict[str, Any]], limit: int = REPORT_DEVICE_LIMIT
+) -> List[Dict[str, Any]]:
+    """
+    Select the devices shown in a report's device table.
+
+    Uses a bounded heap, so large scans cost O(n log limit) rather than a
+    full sort.
+
+    Args:
+        devices: Discovered device dictionaries
+        limit: Maximum number of devices to return
+
+    Returns:
+        Up to limit devices, strongest signal first
+    """
+    return heapq.nlargest(limit, devices, key=_rssi_key)
+
+
+@lru_cache(maxsize=8)
+def get_report_generator(output_dir: Path, company_name: str) -> "ReportGenerator":
+    """
+    Get a shared report generator for the given output settings.
+
+    Args:
+        output_dir: Output directory for reports
+        company_name: Company name for report header
+
+    Returns:
+        Cached ReportGenerator instance
+    """
+    return ReportGenerator(output_dir=output_dir, company_name=company_name)
+
 
 class ReportGenerator(LoggerMixin):
     """Generator for security assessment reports."""
 
+    __slots__ = ("_buffer_pool", "company_name", "logo_path", "output_dir")
+
     def __init__(
         self,
         output_dir: Path = Path("reports"),
@@ -46,6 +394,11 @@ class ReportGenerator(LoggerMixin):
         self.company_name = company_name
         self.logo_path = logo_path
 
+        # In-memory PDF buffers recycled across reports from this generator
+        self._buffer_pool: "queue.LifoQueue[io.BytesIO]" = queue.LifoQueue(
+            maxsize=PDF_BUFFER_POOL_SIZE
+        )
+
         ensure_directory(self.output_dir)
 
     def generate_pdf_report(
@@ -78,10 +431,21 @@ class ReportGenerator(LoggerMixin):
         output_filename = sanitize_filename(output_filename)
         output_path = self.output_dir / output_filename
 
+        rl = _rl()
+        inch = rl.inch
+
         # Create PDF document
-        doc = SimpleDocTemplate(
-            str(output_path),
-            pagesize=letter,
+        # Render into a pooled buffer, then write the file in one go
+        try:
+            buffer = self._buffer_pool.get_nowait()
+        except queue.Empty:
+            buffer = io.BytesIO()
+        buffer.seek(0)
+        buffer.truncate()
+
+        doc = rl.SimpleDocTemplate(
+            buffer,
+            pagesize=rl.letter,
             rightMargin=72,
             leftMargin=72,
             topMargin=72,
@@ -90,154 +454,107 @@ class ReportGenerator(LoggerMixin):
 
         # Build content
         story = []
-        styles = getSampleStyleSheet()
+        styles = _get_styles()
+        table_styles = _get_table_styles()
 
         # Title
-        title_style = ParagraphStyle(
-            "CustomTitle",
-            parent=styles["Heading1"],
-            fontSize=24,
-            textColor=colors.HexColor("#1a1a1a"),
-            spaceAfter=30,
-        )
-
-        story.append(Paragraph("Bluetooth Security Assessment Report", title_style))
-        story.append(Spacer(1, 0.2 * inch))
+        story.append(rl.Paragraph("Bluetooth Security Assessment Report", styles["CustomTitle"]))
+        story.append(rl.Spacer(1, 0.2 * inch))
 
         # Metadata
         metadata = [
             ["Session ID:", session_data.get("session_id", "N/A")],
-            ["Date:", session_data.get("start_time", datetime.utcnow().isoformat())],
+            ["Date:", _session_start(session_data, datetime.utcnow().isoformat())],
             ["Company:", self.company_name],
             ["Generated:", datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")],
         ]
 
-        metadata_table = Table(metadata, colWidths=[2 * inch, 4 * inch])
-        metadata_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (0, -1), colors.lightgrey),
-                    ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, -1), 10),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ]
-            )
-        )
+        metadata_table = rl.Table(metadata, colWidths=[2 * inch, 4 * inch])
+        metadata_table.setStyle(table_styles["metadata"])
 
         story.append(metadata_table)
-        story.append(Spacer(1, 0.3 * inch))
+        story.append(rl.Spacer(1, 0.3 * inch))
 
         # AI Summary (if available)
         if ai_summary:
-            story.append(Paragraph("Executive Summary", styles["Heading2"]))
-            story.append(Spacer(1, 0.1 * inch))
-            story.append(Paragraph(ai_summary, styles["BodyText"]))
-            story.append(Spacer(1, 0.2 * inch))
+            story.append(rl.Paragraph("Executive Summary", styles["Heading2"]))
+            story.append(rl.Spacer(1, 0.1 * inch))
+            story.append(rl.Paragraph(ai_summary, styles["BodyText"]))
+            story.append(rl.Spacer(1, 0.2 * inch))
 
         # Discovered Devices
         devices = session_data.get("devices", [])
         if devices:
-            story.append(Paragraph(f"Discovered Devices ({len(devices)})", styles["Heading2"]))
-            story.append(Spacer(1, 0.1 * inch))
+            story.append(rl.Paragraph(f"Discovered Devices ({len(devices)})", styles["Heading2"]))
+            story.append(rl.Spacer(1, 0.1 * inch))
 
             device_data = [["MAC Address", "Name", "Type", "Signal"]]
-            for device in devices[:20]:  # Limit to first 20
-                device_data.append(
-                    [
-                        device.get("mac", "N/A"),
-                        device.get("name", "Unknown")[:30],
-                        device.get("type", "N/A"),
-                        f"{device.get('rssi', 'N/A')} dBm" if device.get("rssi") else "N/A",
-                    ]
-                )
+            device_data.extend(
+                [
+                    device.get("mac", "N/A"),
+                    device.get("name", "Unknown")[:30],
+                    device.get("type", "N/A"),
+                    f"{device['rssi']} dBm" if device.get("rssi") else "N/A",
+                ]
+                for device in _top_devices(devices)
+            )
 
-            device_table = Table(device_data, colWidths=[1.5 * inch, 2 * inch, 1 * inch, 1 * inch])
-            device_table.setStyle(
-                TableStyle(
-                    [
-                        ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("FONTSIZE", (0, 0), (-1, -1), 9),
-                        ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ]
-                )
+            device_table = rl.Table(
+                device_data, colWidths=[1.5 * inch, 2 * inch, 1 * inch, 1 * inch]
             )
+            device_table.setStyle(table_styles["device"])
 
             story.append(device_table)
-            story.append(Spacer(1, 0.2 * inch))
+            story.append(rl.Spacer(1, 0.2 * inch))
 
         # Attack Simulations
         attacks = session_data.get("attacks", [])
         if attacks:
-            story.append(PageBreak())
-            story.append(Paragraph(f"Security Simulations ({len(attacks)})", styles["Heading2"]))
-            story.append(Spacer(1, 0.1 * inch))
+            story.append(rl.PageBreak())
+            story.append(rl.Paragraph(f"Security Simulations ({len(attacks)})", styles["Heading2"]))
+            story.append(rl.Spacer(1, 0.1 * inch))
 
+            attack_style = table_styles["attack"]
             for idx, attack in enumerate(attacks, 1):
-                story.append(Paragraph(f"Test {idx}: {attack.get('attack_type', 'Unknown')}", styles["Heading3"]))
+                story.append(
+                    rl.Paragraph(
+                        f"Test {idx}: {attack.get('attack_type', 'Unknown')}", styles["Heading3"]
+                    )
+                )
 
+                # Common fields followed by attack-specific details
                 attack_details = [
                     ["Target:", attack.get("target", "N/A")],
                     ["Status:", attack.get("status", "N/A")],
-                    ["Duration:", f"{attack.get('duration_seconds', 0):.2f} seconds"],
+                    ["Duration:", f"{attack.get('duration_seconds') or 0:.2f} seconds"],
+                    *(
+                        [f"{key.replace('_', ' ').title()}:", str(value)]
+                        for key, value in attack.get("details", {}).items()
+                    ),
                 ]
 
-                # Add attack-specific details
-                details = attack.get("details", {})
-                for key, value in details.items():
-                    attack_details.append([f"{key.replace('_', ' ').title()}:", str(value)])
-
-                attack_table = Table(attack_details, colWidths=[2 * inch, 4 * inch])
-                attack_table.setStyle(
-                    TableStyle(
-                        [
-                            ("BACKGROUND", (0, 0), (0, -1), colors.lightgrey),
-                            ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                            ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
-                            ("FONTSIZE", (0, 0), (-1, -1), 9),
-                        ]
-                    )
-                )
+                attack_table = rl.Table(attack_details, colWidths=[2 * inch, 4 * inch])
+                attack_table.setStyle(attack_style)
 
                 story.append(attack_table)
-                story.append(Spacer(1, 0.2 * inch))
+                story.append(rl.Spacer(1, 0.2 * inch))
 
         # Recommendations
-        story.append(PageBreak())
-        story.append(Paragraph("Recommendations", styles["Heading2"]))
-        story.append(Spacer(1, 0.1 * inch))
-
-        recommendations = [
-            "Ensure all Bluetooth devices use strong PINs (6+ digits) and authentication.",
-            "Disable Bluetooth when not in use to reduce attack surface.",
-            "Keep device firmware updated to patch known vulnerabilities.",
-            "Use Bluetooth 5.0+ with enhanced security features.",
-            "Implement proper encryption for sensitive data transmission.",
-            "Monitor for unauthorized Bluetooth devices in the environment.",
-        ]
+        story.append(rl.PageBreak())
+        story.append(rl.Paragraph("Recommendations", styles["Heading2"]))
+        story.append(rl.Spacer(1, 0.1 * inch))
 
-        for rec in recommendations:
-            story.append(Paragraph(f"• {rec}", styles["BodyText"]))
-            story.append(Spacer(1, 0.1 * inch))
-
-        # Disclaimer
-        story.append(Spacer(1, 0.3 * inch))
-        disclaimer = """
-        <b>Disclaimer:</b> This report is provided for authorized security testing purposes only.
-        All tests were conducted with proper authorization. The findings represent potential
-        vulnerabilities identified during the assessment period and should be addressed according
-        to organizational risk management policies.
-        """
-        story.append(Paragraph(disclaimer, styles["BodyText"]))
+        story.extend(_get_closing_flowables())
 
         # Build PDF
-        doc.build(story)
+        try:
+            doc.build(story)
+            atomic_write_bytes(output_path, buffer.getvalue())
+        finally:
+            try:
+                self._buffer_pool.put_nowait(buffer)
+            except queue.Full:
+                pass
 
         self.logger.info("PDF report generated", output=str(output_path))
         return output_path
@@ -271,9 +588,8 @@ class ReportGenerator(LoggerMixin):
         # Generate HTML content
         html_content = self._generate_html(session_data)
 
-        # Write to file
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        # Encode once and write the bytes in a single pass
+        atomic_write_bytes(output_path, html_content.encode("utf-8"))
 
         self.logger.info("HTML report generated", output=str(output_path))
         return output_path
@@ -290,116 +606,44 @@ class ReportGenerator(LoggerMixin):
         """
         devices = session_data.get("devices", [])
         attacks = session_data.get("attacks", [])
+        esc = _escape_html
+
+        parts = [
+            _HTML_HEAD,
+            _HTML_METADATA(
+                session_id=esc(session_data.get("session_id", "N/A")),
+                start_time=esc(_session_start(session_data, "N/A")),
+                company=esc(self.company_name),
+                generated=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"),
+                device_count=len(devices),
+            ),
+        ]
 
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Bluetooth Security Assessment Report</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        h1 {{
-            color: #1a1a1a;
-            border-bottom: 3px solid #007bff;
-            padding-bottom: 10px;
-        }}
-        h2 {{
-            color: #333;
-            margin-top: 30px;
-        }}
-        .metadata {{
-            background-color: white;
-            padding: 20px;
-            border-radius: 5px;
-            margin-bottom: 20px;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            background-color: white;
-            margin-bottom: 20px;
-        }}
-        th, td {{
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid #ddd;
-        }}
-        th {{
-            background-color: #007bff;
-            color: white;
-        }}
-        .status-success {{
-            color: #28a745;
-            font-weight: bold;
-        }}
-        .status-failed {{
-            color: #dc3545;
-            font-weight: bold;
-        }}
-    </style>
-</head>
-<body>
-    <h1>Bluetooth Security Assessment Report</h1>
-
-    <div class="metadata">
-        <p><strong>Session ID:</strong> {session_data.get('session_id', 'N/A')}</p>
-        <p><strong>Date:</strong> {session_data.get('start_time', 'N/A')}</p>
-        <p><strong>Company:</strong> {self.company_name}</p>
-        <p><strong>Generated:</strong> {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
-    </div>
-
-    <h2>Discovered Devices ({len(devices)})</h2>
-    <table>
-        <thead>
-            <tr>
-                <th>MAC Address</th>
-                <th>Name</th>
-                <th>Type</th>
-                <th>Signal (RSSI)</th>
-            </tr>
-        </thead>
-        <tbody>
-        """
-
-        for device in devices[:20]:
-            html += f"""
-            <tr>
-                <td>{device.get('mac', 'N/A')}</td>
-                <td>{device.get('name', 'Unknown')}</td>
-                <td>{device.get('type', 'N/A')}</td>
-                <td>{device.get('rssi', 'N/A')} dBm</td>
-            </tr>
-            """
-
-        html += """
-        </tbody>
-    </table>
-
-    <h2>Security Simulations</h2>
-        """
+        parts.extend(
+            _HTML_DEVICE_ROW(
+                mac=esc(device.get("mac", "N/A")),
+                name=esc(device.get("name", "Unknown")),
+                type=esc(device.get("type", "N/A")),
+                rssi=esc(device.get("rssi", "N/A")),
+            )
+            for device in _top_devices(devices)
+        )
 
-        for attack in attacks:
-            status_class = "status-success" if attack.get("status") == "success" else "status-failed"
-            html += f"""
-    <div class="metadata">
-        <h3>{attack.get('attack_type', 'Unknown')}</h3>
-        <p><strong>Target:</strong> {attack.get('target', 'N/A')}</p>
-        <p><strong>Status:</strong> <span class="{status_class}">{attack.get('status', 'N/A')}</span></p>
-        <p><strong>Duration:</strong> {attack.get('duration_seconds', 0):.2f} seconds</p>
-    </div>
-            """
+        parts.append(_HTML_ATTACKS_HEADER)
+
+        parts.extend(
+            _HTML_ATTACK(
+                attack_type=esc(attack.get("attack_type", "Unknown")),
+                target=esc(attack.get("target", "N/A")),
+                status_class=(
+                    "status-success" if attack.get("status") == "success" else "status-failed"
+                ),
+                status=esc(attack.get("status", "N/A")),
+                duration=attack.get("duration_seconds") or 0,
+            )
+            for attack in attacks
+        )
 
-        html += """
-</body>
-</html>
-        """
+        parts.append(_HTML_TAIL)
 
-        return html
+        return "".join(parts)
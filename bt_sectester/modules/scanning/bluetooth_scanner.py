@@ -5,10 +5,31 @@ Provides concurrent scanning with service enumeration.
 """
 
 import asyncio
+import heapq
+import logging
+import queue
+import re
+import shutil
+import subprocess
 import threading
+from array import array
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 try:
     import bluetooth
@@ -16,18 +37,224 @@ except ImportError:
     bluetooth = None
 
 try:
-    from bleak import BleakScanner
+    from bleak import BleakClient, BleakScanner
 except ImportError:
+    BleakClient = None
     BleakScanner = None
 
 from bt_sectester.utils.helpers import (
     normalize_mac_address,
+    normalize_mac_addresses,
     parse_bluetooth_class,
     validate_mac_address,
+    validate_mac_batch,
 )
 from bt_sectester.utils.logger import LoggerMixin
 from bt_sectester.utils.privileges import PrivilegeManager
 
+T = TypeVar("T")
+
+# Seconds allowed for resolving one classic device's name
+NAME_LOOKUP_TIMEOUT = 5
+
+# Classic name lookups ("hcitool name" processes) in flight at once
+NAME_LOOKUP_CONCURRENCY = 8
+
+# Worker threads of a scanner's private pool (classic discovery, SDP queries)
+SCAN_WORKERS = 4
+
+# Classic SDP queries in flight at once during bulk enumeration; they share
+# the radio, so more mostly queue up in the controller while holding workers
+SDP_CONCURRENCY = 8
+
+# Open GATT connections kept for reuse (adapters support only a few at once)
+BLE_CLIENT_CACHE_SIZE = 4
+
+# Seconds an unused GATT connection stays open; a connected peripheral
+# stops advertising, so idle links would hide it from later scans
+BLE_CLIENT_IDLE_TIMEOUT = 30
+
+# Seconds allowed for closing cached GATT connections on close()
+BLE_DISCONNECT_TIMEOUT = 5
+
+# Devices kept per scan by default; floods of random BLE addresses would
+# otherwise grow devices_found without bound on long scans
+MAX_DEVICES = 10000
+
+# Discovered devices buffered per debug log line
+DISCOVERY_LOG_BATCH = 256
+
+# Stand-in for "no RSSI" in the columnar device store (below any real reading)
+RSSI_UNKNOWN = -32768
+
+_DEVICE_TYPE_CODES = {"classic": 0, "ble": 1, "classic+ble": 2}
+
+# One device line of "hcitool inq" output
+_INQUIRY_LINE = re.compile(
+    r"\s*((?:[0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2})\s+clock offset:\s*\S+\s+class:\s*(0x[0-9A-Fa-f]+)"
+)
+
+
+class _ScanProgress:
+    """Devices found so far by a scan: reports each one and tracks target MACs."""
+
+    __slots__ = ("all_seen", "on_device", "pending", "targets")
+
+    def __init__(
+        self,
+        target_macs: Optional[Set[str]],
+        on_device: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        """
+        Initialize scan progress.
+
+        Must be created on the event loop that runs the scan.
+
+        Args:
+            target_macs: MAC addresses to look for (None or empty to scan
+                for the full duration)
+            on_device: Called on the event loop with each newly found device
+        """
+        self.targets = frozenset(normalize_mac_address(mac) for mac in target_macs or ())
+        self.pending = set(self.targets)
+        self.all_seen = asyncio.Event()
+        self.on_device = on_device
+
+    @property
+    def active(self) -> bool:
+        """Whether the scan may stop early."""
+        return bool(self.pending) or self.all_seen.is_set()
+
+    def mark_seen(self, mac: str) -> None:
+        """
+        Record a sighting of a device.
+
+        Args:
+            mac: Normalized MAC address
+        """
+        if self.pending:
+            self.pending.discard(mac)
+            if not self.pending:
+                self.all_seen.set()
+
+    def device_found(self, device_info: Dict[str, Any]) -> None:
+        """
+        Record a newly discovered device and report it.
+
+        Args:
+            device_info: Device entry as stored in devices_found
+        """
+        self.mark_seen(device_info["mac"])
+        if self.on_device is not None:
+            self.on_device(device_info)
+
+    async def sleep(self, timeout: float) -> None:
+        """
+        Wait for timeout seconds, returning early once all targets are seen.
+
+        Args:
+            timeout: Maximum seconds to wait
+        """
+        if not self.active:
+            await asyncio.sleep(timeout)
+            return
+        try:
+            await asyncio.wait_for(self.all_seen.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+class _DeviceColumns:
+    """
+    Column-wise copy of the RSSI and type of each device of a scan.
+
+    Kept alongside devices_found (which stays the canonical per-MAC record)
+    so ranking and filtering read two flat arrays instead of every dict.
+    """
+
+    __slots__ = ("macs", "rssi", "type_codes", "_base", "_rows")
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self.macs: List[str] = []
+        self.rssi = array("h")
+        self.type_codes = array("b")
+        # Rows are numbered from the first device ever added; _base is the
+        # number of rows dropped from the front since the last clear()
+        self._base = 0
+        self._rows: Dict[str, int] = {}
+
+    def clear(self) -> None:
+        """Drop every device."""
+        self.macs.clear()
+        del self.rssi[:]
+        del self.type_codes[:]
+        self._base = 0
+        self._rows.clear()
+
+    def drop_oldest(self) -> None:
+        """Drop the first device added."""
+        del self._rows[self.macs[0]]
+        del self.macs[0]
+        del self.rssi[0]
+        del self.type_codes[0]
+        self._base += 1
+
+    def update(self, mac: str, device_type: str, rssi: Optional[int]) -> None:
+        """
+        Add a device or update its row.
+
+        Args:
+            mac: Normalized MAC address
+            device_type: "classic", "ble" or "classic+ble"
+            rssi: Signal strength in dBm (None if unknown)
+        """
+        rssi_value = RSSI_UNKNOWN if rssi is None else rssi
+        row = self._rows.get(mac)
+        if row is None:
+            self._rows[mac] = self._base + len(self.macs)
+            self.macs.append(mac)
+            self.rssi.append(rssi_value)
+            self.type_codes.append(_DEVICE_TYPE_CODES[device_type])
+        else:
+            row -= self._base
+            self.rssi[row] = rssi_value
+            self.type_codes[row] = _DEVICE_TYPE_CODES[device_type]
+
+    def strongest(self, limit: int, device_type: Optional[str] = None) -> List[str]:
+        """
+        Get the MACs with the strongest signal.
+
+        Args:
+            limit: Maximum number of MACs
+            device_type: Only consider this type ("classic", "ble" or
+                "classic+ble"; None for all)
+
+        Returns:
+            MACs ordered by descending RSSI, devices without RSSI excluded
+        """
+        rssi = self.rssi
+        rows: Iterable[int] = range(len(rssi))
+        if device_type is not None:
+            code = _DEVICE_TYPE_CODES[device_type]
+            type_codes = self.type_codes
+            rows = [row for row in rows if type_codes[row] == code]
+        rows = heapq.nlargest(limit, rows, key=rssi.__getitem__)
+        return [self.macs[row] for row in rows if rssi[row] != RSSI_UNKNOWN]
+
+    def of_type(self, device_type: str) -> List[str]:
+        """
+        Get the MACs of one device type.
+
+        Args:
+            device_type: "classic", "ble" or "classic+ble"
+
+        Returns:
+            MACs in discovery order
+        """
+        code = _DEVICE_TYPE_CODES[device_type]
+        return [mac for mac, type_code in zip(self.macs, self.type_codes) if type_code == code]
+
 
 class BluetoothScanner(LoggerMixin):
     """Scanner for Bluetooth Classic and BLE devices."""
@@ -36,6 +263,8 @@ class BluetoothScanner(LoggerMixin):
         self,
         adapter: str = "hci0",
         privilege_manager: Optional[PrivilegeManager] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+        max_devices: int = MAX_DEVICES,
     ):
         """
         Initialize Bluetooth scanner.
@@ -43,10 +272,39 @@ class BluetoothScanner(LoggerMixin):
         Args:
             adapter: Bluetooth adapter to use (e.g., hci0)
             privilege_manager: Privilege manager for elevated operations
+            executor: Shared I/O executor for blocking classic operations (a
+                private pool, reused across scans, is created if None)
+            max_devices: Devices kept per scan; the earliest discovered are
+                dropped beyond this
         """
         self.adapter = adapter
+        self._device_id = self._get_device_id()
         self.privilege_manager = privilege_manager
-        self.devices_found: Dict[str, Dict[str, Any]] = {}
+        # Threads are only started on first submit, so an unused pool is free
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=SCAN_WORKERS, thread_name_prefix="bt-scan"
+        )
+        # Devices of the current scan in discovery order, capped at max_devices
+        self.devices_found: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.max_devices = max_devices
+        self._columns = _DeviceColumns()
+
+        # (type, MAC, name, RSSI) of devices awaiting a batched debug line;
+        # None unless a scan is running with debug logging enabled
+        self._discovery_log: Optional[List[Tuple[str, str, str, Optional[int]]]] = None
+
+        # One event loop, started on first use, runs every BLE operation
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
+        # Open GATT connections by MAC, LRU ordered; only touched on self._loop
+        self._clients: "OrderedDict[str, BleakClient]" = OrderedDict()
+        # Per-MAC locks so concurrent enumerations share one connection, the
+        # timers closing idle connections, and disconnects they started
+        self._client_locks: Dict[str, asyncio.Lock] = {}
+        self._idle_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._idle_disconnects: Set[asyncio.Task] = set()
 
         # Check library availability
         if bluetooth is None:
@@ -64,6 +322,7 @@ class BluetoothScanner(LoggerMixin):
                 ret_code, stdout, stderr = self.privilege_manager.execute_privileged(
                     ["hciconfig", self.adapter, "up"],
                     confirm=False,
+                    stdout=subprocess.DEVNULL,
                 )
                 if ret_code == 0:
                     self.logger.info("Bluetooth adapter enabled", adapter=self.adapter)
@@ -76,26 +335,138 @@ class BluetoothScanner(LoggerMixin):
         except Exception as e:
             self.logger.warning("Could not verify adapter status", error=str(e))
 
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the scanner's event loop, starting it on a daemon thread on first use."""
+        if self._loop is None:
+            with self._loop_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(
+                        target=self._run_loop, args=(loop,), name="bt-scan-loop", daemon=True
+                    ).start()
+                    self._loop = loop
+        return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Run an event loop until stopped, then tear it down like asyncio.run.
+
+        Tasks still pending at stop (e.g. scans abandoned by a caller) are
+        cancelled and awaited, and async generators are finalized before
+        the loop is closed.
+
+        Args:
+            loop: Event loop to run on the current thread
+        """
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    def _run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Run a coroutine on the scanner's event loop and wait for its result.
+
+        Safe to call from any thread other than the loop's own.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            Coroutine result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+
+    def close(self) -> None:
+        """Disconnect cached BLE clients and stop the scanner's event loop and private pool."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+        with self._loop_lock:
+            loop = self._loop
+            if loop is None:
+                return
+            if self._clients:
+                try:
+                    asyncio.run_coroutine_threadsafe(self._disconnect_all(), loop).result(
+                        timeout=BLE_DISCONNECT_TIMEOUT
+                    )
+                except Exception as e:
+                    self.logger.warning("Failed to disconnect BLE clients", error=str(e))
+            self._loop = None
+        loop.call_soon_threadsafe(loop.stop)
+
     def scan(
         self,
         duration: int = 10,
         classic: bool = True,
         ble: bool = True,
         concurrent: bool = True,
+        target_macs: Optional[Set[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Scan for Bluetooth devices.
+
+        Blocking wrapper around scan_async, run on the scanner's event loop.
+
+        Args:
+            duration: Scan duration in seconds
+            classic: Enable classic Bluetooth scanning
+            ble: Enable BLE scanning
+            concurrent: Run both scans concurrently
+            target_macs: Return early once all of these MACs have been seen
+
+        Returns:
+            List of discovered devices
+        """
+        return self._run(self.scan_async(duration, classic, ble, concurrent, target_macs))
+
+    async def scan_async(
+        self,
+        duration: int = 10,
+        classic: bool = True,
+        ble: bool = True,
+        concurrent: bool = True,
+        target_macs: Optional[Set[str]] = None,
+        on_device: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Scan for Bluetooth devices.
 
+        The classic inquiry and the BLE scan both run on the calling event
+        loop and report devices as they arrive, so concurrent scans overlap
+        without a dedicated thread pool.
+
+        With target_macs, both scans stop as soon as every target has been
+        seen by either of them.
+
         Args:
             duration: Scan duration in seconds
             classic: Enable classic Bluetooth scanning
             ble: Enable BLE scanning
             concurrent: Run both scans concurrently
+            target_macs: Return early once all of these MACs have been seen
+            on_device: Called on the event loop with each device as soon as
+                it is discovered (later sightings may still fill in its name,
+                RSSI and metadata)
 
         Returns:
             List of discovered devices
         """
+        progress = _ScanProgress(target_macs, on_device)
+
         self.devices_found.clear()
+        self._columns.clear()
+        self._discovery_log = [] if self.logger.is_enabled_for(logging.DEBUG) else None
         self.logger.info(
             "Starting Bluetooth scan",
             duration=duration,
@@ -104,18 +475,23 @@ class BluetoothScanner(LoggerMixin):
             concurrent=concurrent,
         )
 
-        if concurrent and classic and ble:
-            # Run both scans in parallel
-            with ThreadPoolExecutor(max_workers=2) as executor:
-                classic_future = executor.submit(self._scan_classic, duration)
-                ble_future = executor.submit(self._scan_ble, duration)
-
-                classic_devices = classic_future.result()
-                ble_devices = ble_future.result()
-        else:
-            # Run scans sequentially
-            classic_devices = self._scan_classic(duration) if classic else []
-            ble_devices = self._scan_ble(duration) if ble else []
+        try:
+            if concurrent and classic and ble:
+                # Run both scans in parallel
+                classic_devices, ble_count = await asyncio.gather(
+                    self._scan_classic(duration, progress),
+                    self._scan_ble(duration, progress),
+                )
+            else:
+                # Run scans sequentially
+                classic_devices = await self._scan_classic(duration, progress) if classic else []
+                if ble and not progress.all_seen.is_set():
+                    ble_count = await self._scan_ble(duration, progress)
+                else:
+                    ble_count = 0
+        finally:
+            self._flush_discovery_log()
+            self._discovery_log = None
 
         # Merge results
         all_devices = list(self.devices_found.values())
@@ -124,143 +500,578 @@ class BluetoothScanner(LoggerMixin):
             "Scan complete",
             total_devices=len(all_devices),
             classic_count=len(classic_devices),
-            ble_count=len(ble_devices),
+            ble_count=ble_count,
         )
 
         return all_devices
 
-    def _scan_classic(self, duration: int) -> List[Dict[str, Any]]:
+    async def scan_iter_async(
+        self,
+        duration: int = 10,
+        classic: bool = True,
+        ble: bool = True,
+        concurrent: bool = True,
+        target_macs: Optional[Set[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Scan for Bluetooth devices, yielding each one as it is discovered.
+
+        Stopping iteration early cancels the scan.
+
+        Args:
+            duration: Scan duration in seconds
+            classic: Enable classic Bluetooth scanning
+            ble: Enable BLE scanning
+            concurrent: Run both scans concurrently
+            target_macs: Stop once all of these MACs have been seen
+
+        Yields:
+            Discovered devices
+        """
+        found: asyncio.Queue = asyncio.Queue()
+        task = asyncio.ensure_future(
+            self.scan_async(duration, classic, ble, concurrent, target_macs, found.put_nowait)
+        )
+        task.add_done_callback(lambda _: found.put_nowait(None))
+        try:
+            while (device_info := await found.get()) is not None:
+                yield device_info
+            await task
+        finally:
+            task.cancel()
+
+    def scan_iter(
+        self,
+        duration: int = 10,
+        classic: bool = True,
+        ble: bool = True,
+        concurrent: bool = True,
+        target_macs: Optional[Set[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Scan for Bluetooth devices, yielding each one as it is discovered.
+
+        Blocking counterpart of scan_iter_async, run on the scanner's event
+        loop. Closing the iterator early cancels the scan.
+
+        Args:
+            duration: Scan duration in seconds
+            classic: Enable classic Bluetooth scanning
+            ble: Enable BLE scanning
+            concurrent: Run both scans concurrently
+            target_macs: Stop once all of these MACs have been seen
+
+        Yields:
+            Discovered devices
+        """
+        found: queue.SimpleQueue = queue.SimpleQueue()
+        future = asyncio.run_coroutine_threadsafe(
+            self.scan_async(duration, classic, ble, concurrent, target_macs, found.put),
+            self._get_loop(),
+        )
+        future.add_done_callback(lambda _: found.put(None))
+        try:
+            while (device_info := found.get()) is not None:
+                yield device_info
+            future.result()
+        finally:
+            future.cancel()
+
+    def strongest_devices(
+        self, limit: int, device_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the devices of the last scan with the strongest signal.
+
+        Args:
+            limit: Maximum number of devices
+            device_type: Only consider this type (None for all)
+
+        Returns:
+            Devices ordered by descending RSSI (devices without RSSI excluded)
+        """
+        return [self.devices_found[mac] for mac in self._columns.strongest(limit, device_type)]
+
+    def devices_of_type(self, device_type: str) -> List[Dict[str, Any]]:
+        """
+        Get the devices of the last scan of one type.
+
+        Args:
+            device_type: "classic", "ble" or "classic+ble"
+
+        Returns:
+            Devices in discovery order
+        """
+        return [self.devices_found[mac] for mac in self._columns.of_type(device_type)]
+
+    def _log_discovery(self, device_info: Dict[str, Any]) -> None:
+        """
+        Queue a discovered device for the next batched debug log line.
+
+        Args:
+            device_info: Device entry
+        """
+        batch = self._discovery_log
+        if batch is None:
+            return
+        batch.append(
+            (device_info["type"], device_info["mac"], device_info["name"], device_info["rssi"])
+        )
+        if len(batch) >= DISCOVERY_LOG_BATCH:
+            self._flush_discovery_log()
+
+    def _flush_discovery_log(self) -> None:
+        """Log the queued discovered devices in one debug line."""
+        batch = self._discovery_log
+        if batch:
+            self._discovery_log = []
+            self.logger.debug("Devices discovered", count=len(batch), devices=batch)
+
+    def _add_device(self, device_info: Dict[str, Any]) -> None:
+        """
+        Add a newly discovered device, dropping the earliest one if full.
+
+        Args:
+            device_info: Device entry
+        """
+        if len(self.devices_found) >= self.max_devices:
+            self.devices_found.popitem(last=False)
+            self._columns.drop_oldest()
+        mac = device_info["mac"]
+        self.devices_found[mac] = device_info
+        self._columns.update(mac, device_info["type"], device_info["rssi"])
+
+    async def _scan_classic(self, duration: int, progress: _ScanProgress) -> List[Dict[str, Any]]:
         """
         Scan for classic Bluetooth devices.
 
+        Streams "hcitool inq" when it is installed. Otherwise falls back to
+        PyBluez's blocking discovery in the executor, which cannot stop
+        early; it is abandoned (left to finish in the background, its result
+        dropped) once all targets have been seen. Its devices are recorded
+        on the event loop, never from the executor thread.
+
         Args:
             duration: Scan duration in seconds
+            progress: Progress of the scan (target MACs, device callback)
 
         Returns:
             List of discovered classic devices
         """
+        if shutil.which("hcitool") is not None:
+            return await self._stream_inquiry(duration, progress)
+
         if bluetooth is None:
             self.logger.warning("PyBluez not available. Skipping classic scan.")
             return []
 
+        loop = asyncio.get_running_loop()
+        discovery = loop.run_in_executor(self._executor, self._discover_classic, duration)
+        if progress.active:
+            all_seen = asyncio.ensure_future(progress.all_seen.wait())
+            await asyncio.wait({discovery, all_seen}, return_when=asyncio.FIRST_COMPLETED)
+            all_seen.cancel()
+            if not discovery.done():
+                return []
+
+        # One timestamp for the whole inquiry, which reports all devices at once
+        discovered_at = datetime.utcnow().isoformat()
+        devices: List[Dict[str, Any]] = []
+        for addr, name, device_class in await discovery:
+            device_info = self._record_classic(addr, name, device_class, devices, discovered_at)
+            if device_info is not None:
+                self._report_classic(device_info, progress)
+
+        self.logger.debug("Classic scan complete", device_count=len(devices))
+        return devices
+
+    def _report_classic(self, device_info: Dict[str, Any], progress: _ScanProgress) -> None:
+        """
+        Report a recorded classic device to the scan progress.
+
+        Args:
+            device_info: Device info returned by _record_classic
+            progress: Progress of the scan
+        """
+        mac = device_info["mac"]
+        if self.devices_found.get(mac) is device_info:
+            progress.device_found(device_info)
+        else:
+            # Merged into an earlier BLE sighting, which was already reported
+            progress.mark_seen(mac)
+
+    async def _stream_inquiry(self, duration: int, progress: _ScanProgress) -> List[Dict[str, Any]]:
+        """
+        Run "hcitool inq", recording devices as the inquiry reports them.
+
+        Args:
+            duration: Inquiry length, in the same units PyBluez uses
+            progress: Progress of the scan (target MACs, device callback)
+
+        Returns:
+            List of discovered classic devices
+        """
+        self.logger.debug("Starting classic Bluetooth inquiry")
+        devices: List[Dict[str, Any]] = []
+
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "hcitool",
+                "-i",
+                self.adapter,
+                "inq",
+                f"--length={duration}",
+                "--flush",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except OSError as e:
+            self.logger.error("Classic scan failed to start", error=str(e))
+            return devices
+
+        async def read_inquiry() -> None:
+            async for raw_line in proc.stdout:
+                match = _INQUIRY_LINE.match(raw_line.decode("utf-8", "replace"))
+                if match:
+                    device_info = self._record_classic(
+                        match.group(1), None, int(match.group(2), 16), devices
+                    )
+                    if device_info is not None:
+                        self._report_classic(device_info, progress)
+
+        reader = asyncio.ensure_future(read_inquiry())
+        waiters = {reader}
+        if progress.active:
+            waiters.add(asyncio.ensure_future(progress.all_seen.wait()))
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+            if proc.returncode is None:
+                proc.terminate()
+            await proc.wait()
+
+        # Names need a connection per device, so they are resolved after the
+        # inquiry rather than holding up discovery. After an early stop only
+        # the targets are looked up, so the stop is not undone by lookups.
+        if progress.all_seen.is_set():
+            unnamed = [device for device in devices if device["mac"] in progress.targets]
+        else:
+            unnamed = devices
+        lookup_slots = asyncio.Semaphore(NAME_LOOKUP_CONCURRENCY)
+
+        async def resolve_name(device_info: Dict[str, Any]) -> None:
+            async with lookup_slots:
+                device_info["name"] = await self._lookup_name(device_info["mac"]) or "Unknown"
+
+        await asyncio.gather(*(resolve_name(device_info) for device_info in unnamed))
+
+        self.logger.debug("Classic scan complete", device_count=len(devices))
+        return devices
+
+    async def _lookup_name(self, mac: str) -> Optional[str]:
+        """
+        Resolve a classic device's name with "hcitool name".
+
+        Args:
+            mac: Device MAC address
+
+        Returns:
+            Device name, or None if it could not be resolved
+        """
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "hcitool",
+                "-i",
+                self.adapter,
+                "name",
+                mac,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except OSError:
+            return None
+
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=NAME_LOOKUP_TIMEOUT)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return None
+
+        return stdout.decode("utf-8", "replace").strip() or None
+
+    def _record_classic(
+        self,
+        addr: str,
+        name: Optional[str],
+        device_class: int,
+        devices: List[Dict[str, Any]],
+        discovered_at: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Add a classic device to the scan results, merging with a BLE sighting.
+
+        Args:
+            addr: Device address as reported
+            name: Device name, if known
+            device_class: Class of device
+            devices: Classic devices of this scan pass, appended to if new
+            discovered_at: Discovery timestamp (now if None)
+
+        Returns:
+            The recorded device info, or None if this pass already had it
+        """
+        mac = normalize_mac_address(addr)
+        existing = self.devices_found.get(mac)
+        if existing is not None and "classic" in existing["type"]:
+            return None
+
+        device_info = {
+            "mac": mac,
+            "name": name or "Unknown",
+            "type": "classic",
+            "device_class": device_class,
+            "device_class_parsed": parse_bluetooth_class(device_class),
+            "discovered_at": discovered_at or datetime.utcnow().isoformat(),
+            "rssi": None,  # Classic scan doesn't provide RSSI
+        }
+
+        if existing is not None:
+            # Already seen over BLE; keep its RSSI and metadata
+            existing["type"] = "classic+ble"
+            existing["device_class"] = device_class
+            existing["device_class_parsed"] = device_info["device_class_parsed"]
+            self._columns.update(mac, "classic+ble", existing["rssi"])
+        else:
+            self._add_device(device_info)
+            devices.append(device_info)
+
+        self._log_discovery(device_info)
+        return device_info
+
+    def _discover_classic(self, duration: int) -> List[Tuple[str, Optional[str], int]]:
+        """
+        Scan for classic Bluetooth devices with PyBluez (blocking).
+
+        Runs in the executor, so it only returns what PyBluez reported and
+        leaves recording the devices to the event loop.
+
+        Args:
+            duration: Scan duration in seconds
+
+        Returns:
+            List of (address, name, device class) tuples
+        """
         self.logger.debug("Starting classic Bluetooth scan")
-        devices = []
 
         try:
             # Discover nearby devices
-            nearby_devices = bluetooth.discover_devices(
+            return bluetooth.discover_devices(
                 duration=duration,
                 lookup_names=True,
                 lookup_class=True,
-                device_id=self._get_device_id(),
+                device_id=self._device_id,
             )
-
-            for addr, name, device_class in nearby_devices:
-                device_info = {
-                    "mac": normalize_mac_address(addr),
-                    "name": name or "Unknown",
-                    "type": "classic",
-                    "device_class": device_class,
-                    "device_class_parsed": parse_bluetooth_class(device_class),
-                    "discovered_at": datetime.utcnow().isoformat(),
-                    "rssi": None,  # Classic scan doesn't provide RSSI
-                }
-
-                self.devices_found[device_info["mac"]] = device_info
-                devices.append(device_info)
-
-                self.logger.debug(
-                    "Classic device discovered",
-                    mac=device_info["mac"],
-                    name=device_info["name"],
-                )
-
         except OSError as e:
             self.logger.error("Classic scan failed. May require elevated privileges.", error=str(e))
         except Exception as e:
             self.logger.error("Classic scan error", error=str(e))
+        return []
 
-        self.logger.debug("Classic scan complete", device_count=len(devices))
-        return devices
-
-    def _scan_ble(self, duration: int) -> List[Dict[str, Any]]:
+    async def _scan_ble(self, duration: int, progress: _ScanProgress) -> int:
         """
         Scan for BLE devices.
 
+        Devices are added to devices_found (not collected in a list of their
+        own) so that max_devices bounds the memory of long scans.
+
         Args:
             duration: Scan duration in seconds
+            progress: Progress of the scan (target MACs, device callback)
 
         Returns:
-            List of discovered BLE devices
+            Number of new BLE devices discovered
         """
         if BleakScanner is None:
             self.logger.warning("Bleak not available. Skipping BLE scan.")
-            return []
+            return 0
 
         self.logger.debug("Starting BLE scan")
-        devices = []
+        device_count = 0
 
         try:
-            # Run async scan in a new event loop (to avoid conflicts)
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            devices = loop.run_until_complete(self._async_ble_scan(duration))
-            loop.close()
-
+            device_count = await self._async_ble_scan(duration, progress)
         except Exception as e:
             self.logger.error("BLE scan error", error=str(e))
 
-        self.logger.debug("BLE scan complete", device_count=len(devices))
-        return devices
+        self.logger.debug("BLE scan complete", device_count=device_count)
+        return device_count
 
-    async def _async_ble_scan(self, duration: int) -> List[Dict[str, Any]]:
+    async def _async_ble_scan(self, duration: int, progress: _ScanProgress) -> int:
         """
         Async BLE scan implementation.
 
         Args:
             duration: Scan duration in seconds
+            progress: Progress of the scan; it stops once all target MACs
+                have been seen by either scan type
 
         Returns:
-            List of discovered BLE devices
+            Number of new BLE devices discovered
         """
-        devices = []
+        device_count = 0
+
+        # Latest device, advertisement and normalized MAC per device, keyed
+        # by the address as reported. Devices advertise many times a second,
+        # so repeats only replace the device and advertisement; the device
+        # entry is built (and reported) on the first sighting and refreshed
+        # after the scan. Capped like devices_found, dropping the earliest
+        # sighted first.
+        seen: Dict[str, Tuple[Any, Any, str]] = {}
+
+        def on_detection(device: Any, advertisement: Any) -> None:
+            nonlocal device_count
+            address = device.address
+            entry = seen.get(address)
+            if entry is not None:
+                seen[address] = (device, advertisement, entry[2])
+                return
+
+            if len(seen) >= self.max_devices:
+                del seen[next(iter(seen))]
+            mac = normalize_mac_address(address)
+            seen[address] = (device, advertisement, mac)
+            device_info = self._record_ble(mac, device, advertisement)
+            if device_info is not None:
+                device_count += 1
+                progress.device_found(device_info)
+            else:
+                progress.mark_seen(mac)
+
+        async with BleakScanner(detection_callback=on_detection):
+            await progress.sleep(duration)
+
+        # Keep the signal strength and metadata of the last advertisement, and
+        # a name that only arrived in a later advertisement or scan response
+        for device, advertisement, mac in seen.values():
+            device_info = self.devices_found.get(mac)
+            if device_info is None:
+                continue
+            if device_info["name"] == "Unknown":
+                device_info["name"] = device.name or advertisement.local_name or "Unknown"
+            device_info["rssi"] = advertisement.rssi
+            metadata_key = "metadata" if device_info["type"] == "ble" else "ble_metadata"
+            device_info[metadata_key] = self._ble_metadata(advertisement)
+            self._columns.update(mac, device_info["type"], advertisement.rssi)
+
+        return device_count
+
+    def _record_ble(self, mac: str, device: Any, advertisement: Any) -> Optional[Dict[str, Any]]:
+        """
+        Record a BLE device on its first sighting, merging with a classic sighting.
 
-        discovered_devices = await BleakScanner.discover(timeout=duration)
+        Args:
+            mac: Normalized MAC address
+            device: Bleak BLEDevice
+            advertisement: Bleak AdvertisementData
 
-        for device in discovered_devices:
-            device_info = {
-                "mac": normalize_mac_address(device.address),
-                "name": device.name or "Unknown",
-                "type": "ble",
-                "rssi": device.rssi,
-                "discovered_at": datetime.utcnow().isoformat(),
-                "metadata": device.metadata,
-            }
+        Returns:
+            New device entry, or None if the device was already known
+        """
+        device_info = {
+            "mac": mac,
+            "name": device.name or advertisement.local_name or "Unknown",
+            "type": "ble",
+            "rssi": advertisement.rssi,
+            "discovered_at": datetime.utcnow().isoformat(),
+            "metadata": self._ble_metadata(advertisement),
+        }
 
-            # Avoid duplicates (in case device found in both scans)
-            mac = device_info["mac"]
-            if mac in self.devices_found:
+        self._log_discovery(device_info)
+
+        # Avoid duplicates (in case device found in both scans)
+        existing = self.devices_found.get(mac)
+        if existing is not None:
+            if existing["type"] == "classic":
                 # Merge information
-                self.devices_found[mac]["type"] = "classic+ble"
-                self.devices_found[mac]["rssi"] = device_info["rssi"]
-                self.devices_found[mac]["ble_metadata"] = device_info["metadata"]
+                existing["type"] = "classic+ble"
+                existing["ble_metadata"] = device_info["metadata"]
             else:
-                self.devices_found[mac] = device_info
-                devices.append(device_info)
-
-            self.logger.debug(
-                "BLE device discovered",
-                mac=device_info["mac"],
-                name=device_info["name"],
-                rssi=device_info["rssi"],
-            )
+                # Seen again after dropping out of the sighting cache
+                metadata_key = "metadata" if existing["type"] == "ble" else "ble_metadata"
+                existing[metadata_key] = device_info["metadata"]
+            existing["rssi"] = device_info["rssi"]
+            self._columns.update(mac, existing["type"], device_info["rssi"])
+            return None
+
+        self._add_device(device_info)
+        return device_info
+
+    @staticmethod
+    def _ble_metadata(advertisement: Any) -> Dict[str, Any]:
+        """
+        Extract the advertisement fields kept as device metadata.
 
-        return devices
+        Args:
+            advertisement: Bleak AdvertisementData
+
+        Returns:
+            Advertised service UUIDs and manufacturer data
+        """
+        return {
+            "uuids": advertisement.service_uuids,
+            "manufacturer_data": advertisement.manufacturer_data,
+        }
+
+    @staticmethod
+    def _collect_services(mac: str, client: Any) -> List[Dict[str, Any]]:
+        """
+        Describe the GATT services of a connected client.
+
+        Args:
+            mac: Device MAC address
+            client: BleakClient with services resolved
+
+        Returns:
+            Service descriptions with their characteristics
+
+        Raises:
+            ConnectionError: If the client is not connected
+        """
+        if not client.is_connected:
+            raise ConnectionError(f"Failed to connect to {mac}")
+
+        service_list = []
+
+        # Get all services
+        for service in client.services:
+            service_info = {
+                "uuid": str(service.uuid),
+                "description": service.description,
+                "characteristics": [],
+            }
+
+            # Get characteristics for each service
+            for char in service.characteristics:
+                char_info = {
+                    "uuid": str(char.uuid),
+                    "description": char.description,
+                    "properties": char.properties,
+                }
+                service_info["characteristics"].append(char_info)
+
+            service_list.append(service_info)
+
+        return service_list
 
     def _get_device_id(self) -> int:
         """
         Get device ID from adapter name.
 
+        Called once at construction; scans use the cached _device_id.
+
         Returns:
             Device ID (e.g., 0 for hci0)
         """
@@ -290,7 +1101,7 @@ class BluetoothScanner(LoggerMixin):
         if not device:
             # Try a quick scan to find the device
             self.logger.debug("Device not in cache, performing rescan")
-            self.scan(duration=5)
+            self.scan(duration=5, target_macs={mac})
             device = self.devices_found.get(mac)
 
         if not device:
@@ -305,6 +1116,88 @@ class BluetoothScanner(LoggerMixin):
         else:
             raise ValueError(f"Unknown device type: {device_type}")
 
+    def enumerate_services_bulk(self, mac_addresses: List[str]) -> List[Dict[str, Any]]:
+        """
+        Enumerate services for several devices concurrently.
+
+        Blocking wrapper around enumerate_services_bulk_async, run on the
+        scanner's event loop.
+
+        Args:
+            mac_addresses: Target device MAC addresses
+
+        Returns:
+            One entry per MAC, in input order (see enumerate_services_bulk_async)
+        """
+        return self._run(self.enumerate_services_bulk_async(mac_addresses))
+
+    async def enumerate_services_bulk_async(self, mac_addresses: List[str]) -> List[Dict[str, Any]]:
+        """
+        Enumerate services for several devices concurrently.
+
+        Classic SDP queries run in the executor (at most SDP_CONCURRENCY at a
+        time) and BLE GATT enumerations on the event loop, all concurrently,
+        so N devices take about as long as the slowest one rather than the
+        sum. Devices missing from the last scan are looked for in a single
+        rescan.
+
+        Args:
+            mac_addresses: Target device MAC addresses
+
+        Returns:
+            One entry per MAC, in input order: its service information, or
+            {"mac": ..., "error": ...} if it could not be enumerated
+
+        Raises:
+            ValueError: If any MAC address is invalid
+        """
+        for mac_address, valid in zip(mac_addresses, validate_mac_batch(mac_addresses)):
+            if not valid:
+                raise ValueError(f"Invalid MAC address: {mac_address}")
+        macs = normalize_mac_addresses(mac_addresses)
+
+        self.logger.info("Enumerating services", device_count=len(macs))
+
+        # A rescan replaces devices_found, so keep the devices already known
+        known = {mac: self.devices_found[mac] for mac in macs if mac in self.devices_found}
+        missing = set(macs) - known.keys()
+        if missing:
+            self.logger.debug("Devices not in cache, performing rescan", missing=len(missing))
+            await self.scan_async(duration=5, target_macs=missing)
+
+        loop = asyncio.get_running_loop()
+        sdp_slots = asyncio.Semaphore(SDP_CONCURRENCY)
+
+        async def enumerate_one(mac: str) -> Dict[str, Any]:
+            device = known.get(mac) or self.devices_found.get(mac)
+            if not device:
+                raise ValueError(f"Device not found: {mac}")
+
+            device_type = device.get("type", "unknown")
+            if "classic" in device_type:
+                async with sdp_slots:
+                    return await loop.run_in_executor(
+                        self._executor, self._enumerate_classic_services, mac
+                    )
+            elif device_type == "ble":
+                if BleakScanner is None:
+                    raise RuntimeError("Bleak not available")
+                return await self._async_enumerate_ble(mac)
+            else:
+                raise ValueError(f"Unknown device type: {device_type}")
+
+        results = await asyncio.gather(
+            *(enumerate_one(mac) for mac in macs), return_exceptions=True
+        )
+
+        entries = []
+        for mac, result in zip(macs, results):
+            if isinstance(result, Exception):
+                self.logger.warning("Service enumeration failed", mac=mac, error=str(result))
+                result = {"mac": mac, "error": str(result)}
+            entries.append(result)
+        return entries
+
     def _enumerate_classic_services(self, mac: str) -> Dict[str, Any]:
         """
         Enumerate classic Bluetooth services (SDP).
@@ -372,55 +1265,127 @@ class BluetoothScanner(LoggerMixin):
         self.logger.debug("Enumerating BLE services", mac=mac)
 
         try:
-            # Run async enumeration
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(self._async_enumerate_ble(mac))
-            loop.close()
-            return result
+            return self._run(self._async_enumerate_ble(mac))
 
         except Exception as e:
             self.logger.error("Failed to enumerate BLE services", mac=mac, error=str(e))
             raise
 
-    async def _async_enumerate_ble(self, mac: str) -> Dict[str, Any]:
+    async def _get_client(self, mac: str) -> "BleakClient":
         """
-        Async BLE service enumeration.
+        Get a connected client for a device, reusing a cached connection.
+
+        Only used on the scanner's own event loop, which the cached clients
+        are bound to, with the MAC's client lock held. The least recently
+        used idle connection is closed once more than BLE_CLIENT_CACHE_SIZE
+        are open.
 
         Args:
             mac: Device MAC address
 
         Returns:
-            Service information
+            Connected client
         """
-        from bleak import BleakClient
+        self._cancel_idle_timer(mac)
 
-        service_list = []
+        client = self._clients.pop(mac, None)
+        if client is None or not client.is_connected:
+            client = BleakClient(mac)
+            await client.connect()
+        self._clients[mac] = client
 
-        async with BleakClient(mac) as client:
-            if not client.is_connected:
-                raise ConnectionError(f"Failed to connect to {mac}")
+        # Connections in use by another enumeration are left open
+        for evicted_mac in list(self._clients)[: len(self._clients) - BLE_CLIENT_CACHE_SIZE]:
+            if not self._client_locks[evicted_mac].locked():
+                self._cancel_idle_timer(evicted_mac)
+                await self._disconnect(self._clients.pop(evicted_mac))
 
-            # Get all services
-            services = client.services
+        return client
 
-            for service in services:
-                service_info = {
-                    "uuid": str(service.uuid),
-                    "description": service.description,
-                    "characteristics": [],
-                }
+    def _cancel_idle_timer(self, mac: str) -> None:
+        """
+        Cancel the timer that would close a cached connection.
 
-                # Get characteristics for each service
-                for char in service.characteristics:
-                    char_info = {
-                        "uuid": str(char.uuid),
-                        "description": char.description,
-                        "properties": char.properties,
-                    }
-                    service_info["characteristics"].append(char_info)
+        Args:
+            mac: Device MAC address
+        """
+        handle = self._idle_handles.pop(mac, None)
+        if handle is not None:
+            handle.cancel()
 
-                service_list.append(service_info)
+    def _expire_client(self, mac: str) -> None:
+        """
+        Close a cached connection that has not been used for BLE_CLIENT_IDLE_TIMEOUT.
+
+        Args:
+            mac: Device MAC address
+        """
+        self._idle_handles.pop(mac, None)
+        if self._client_locks[mac].locked():
+            # In use again; the timer is restarted once that enumeration ends
+            return
+        client = self._clients.pop(mac, None)
+        if client is not None:
+            task = asyncio.ensure_future(self._disconnect(client))
+            self._idle_disconnects.add(task)
+            task.add_done_callback(self._idle_disconnects.discard)
+
+    async def _disconnect(self, client: "BleakClient") -> None:
+        """
+        Disconnect a client, ignoring errors from already-dropped links.
+
+        Args:
+            client: Client to disconnect
+        """
+        try:
+            await client.disconnect()
+        except Exception as e:
+            self.logger.debug("BLE disconnect failed", error=str(e))
+
+    async def _disconnect_all(self) -> None:
+        """Disconnect every cached client."""
+        for handle in self._idle_handles.values():
+            handle.cancel()
+        self._idle_handles.clear()
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await self._disconnect(client)
+        if self._idle_disconnects:
+            await asyncio.gather(*self._idle_disconnects, return_exceptions=True)
+
+    async def _async_enumerate_ble(self, mac: str) -> Dict[str, Any]:
+        """
+        Async BLE service enumeration.
+
+        On the scanner's event loop the connection is kept open for later
+        enumerations of the same device, until it has been idle for
+        BLE_CLIENT_IDLE_TIMEOUT seconds.
+
+        Args:
+            mac: Device MAC address
+
+        Returns:
+            Service information
+        """
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            # Kept for the scanner's lifetime: one small lock per device enumerated
+            lock = self._client_locks.setdefault(mac, asyncio.Lock())
+            async with lock:
+                client = await self._get_client(mac)
+                try:
+                    service_list = self._collect_services(mac, client)
+                except Exception:
+                    self._clients.pop(mac, None)
+                    await self._disconnect(client)
+                    raise
+                self._idle_handles[mac] = loop.call_later(
+                    BLE_CLIENT_IDLE_TIMEOUT, self._expire_client, mac
+                )
+        else:
+            async with BleakClient(mac) as client:
+                service_list = self._collect_services(mac, client)
 
         result = {
             "mac": mac,
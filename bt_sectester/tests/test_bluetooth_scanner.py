@@ -0,0 +1,136 @@
+"""
+Tests for the Bluetooth scanner's pure-Python helpers.
+"""
+
+import asyncio
+
+from bt_sectester.modules.scanning.bluetooth_scanner import (
+    _INQUIRY_LINE,
+    RSSI_UNKNOWN,
+    _DeviceColumns,
+    _ScanProgress,
+)
+
+MAC_A = "AA:BB:CC:DD:EE:01"
+MAC_B = "AA:BB:CC:DD:EE:02"
+MAC_C = "AA:BB:CC:DD:EE:03"
+MAC_D = "AA:BB:CC:DD:EE:04"
+
+
+def test_device_columns_update():
+    """Test adding devices and updating their rows."""
+    columns = _DeviceColumns()
+    columns.update(MAC_A, "ble", -70)
+    columns.update(MAC_B, "classic", None)
+    columns.update(MAC_C, "ble", -40)
+
+    assert columns.macs == [MAC_A, MAC_B, MAC_C]
+    assert list(columns.rssi) == [-70, RSSI_UNKNOWN, -40]
+
+    # Updating an existing device rewrites its row in place
+    columns.update(MAC_B, "classic+ble", -50)
+    assert columns.macs == [MAC_A, MAC_B, MAC_C]
+    assert list(columns.rssi) == [-70, -50, -40]
+
+    assert columns.strongest(2) == [MAC_C, MAC_B]
+    assert columns.strongest(10, "ble") == [MAC_C, MAC_A]
+    assert columns.of_type("ble") == [MAC_A, MAC_C]
+    assert columns.of_type("classic+ble") == [MAC_B]
+
+
+def test_device_columns_strongest_skips_unknown_rssi():
+    """Test that devices without RSSI are left out of the ranking."""
+    columns = _DeviceColumns()
+    columns.update(MAC_A, "classic", None)
+    columns.update(MAC_B, "ble", -80)
+
+    assert columns.strongest(5) == [MAC_B]
+    assert columns.strongest(5, "classic") == []
+
+
+def test_device_columns_drop_oldest():
+    """Test that rows stay addressable after evicting from the front."""
+    columns = _DeviceColumns()
+    columns.update(MAC_A, "ble", -70)
+    columns.update(MAC_B, "ble", -60)
+    columns.update(MAC_C, "ble", -50)
+
+    columns.drop_oldest()
+    assert columns.macs == [MAC_B, MAC_C]
+
+    # Later updates and additions land on the right rows
+    columns.update(MAC_C, "classic+ble", -30)
+    columns.update(MAC_D, "classic", -90)
+    columns.drop_oldest()
+    columns.update(MAC_D, "classic", -20)
+
+    assert columns.macs == [MAC_C, MAC_D]
+    assert list(columns.rssi) == [-30, -20]
+    assert columns.of_type("classic+ble") == [MAC_C]
+    assert columns.strongest(1) == [MAC_D]
+
+    # A dropped device is added again as a new row
+    columns.update(MAC_A, "ble", -10)
+    assert columns.macs == [MAC_C, MAC_D, MAC_A]
+    assert columns.strongest(3) == [MAC_A, MAC_D, MAC_C]
+
+
+def test_device_columns_clear():
+    """Test that clearing resets the row numbering."""
+    columns = _DeviceColumns()
+    columns.update(MAC_A, "ble", -70)
+    columns.update(MAC_B, "ble", -60)
+    columns.drop_oldest()
+    columns.clear()
+
+    columns.update(MAC_C, "ble", -50)
+    columns.update(MAC_C, "ble", -45)
+    assert columns.macs == [MAC_C]
+    assert list(columns.rssi) == [-45]
+
+
+def test_scan_progress_without_targets():
+    """Test that a scan without targets never stops early."""
+
+    async def run():
+        progress = _ScanProgress(None)
+        assert not progress.active
+        progress.device_found({"mac": MAC_A})
+        assert not progress.all_seen.is_set()
+
+    asyncio.run(run())
+
+
+def test_scan_progress_early_stop():
+    """Test that seeing every target ends the scan early."""
+    found = []
+
+    async def run():
+        progress = _ScanProgress({MAC_A.lower(), MAC_B}, found.append)
+        assert progress.active
+        assert progress.targets == {MAC_A, MAC_B}
+
+        progress.mark_seen(MAC_A)
+        progress.device_found({"mac": MAC_C})
+        assert not progress.all_seen.is_set()
+
+        progress.device_found({"mac": MAC_B})
+        assert progress.all_seen.is_set()
+        assert progress.active
+
+        # Returns at once instead of waiting out the timeout
+        await asyncio.wait_for(progress.sleep(60), timeout=1)
+
+    asyncio.run(run())
+    assert found == [{"mac": MAC_C}, {"mac": MAC_B}]
+
+
+def test_inquiry_line():
+    """Test parsing device lines of "hcitool inq" output."""
+    match = _INQUIRY_LINE.match("\taa:bb:cc:dd:ee:01\tclock offset: 0x1234\tclass: 0x5a020c")
+    assert match is not None
+    assert match.group(1) == "aa:bb:cc:dd:ee:01"
+    assert int(match.group(2), 16) == 0x5A020C
+
+    assert _INQUIRY_LINE.match("Inquiring ...") is None
+    assert _INQUIRY_LINE.match("\tAA:BB:CC:DD:EE\tclock offset: 0x1234\tclass: 0x5a020c") is None
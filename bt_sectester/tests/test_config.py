@@ -43,6 +43,24 @@ def test_config_load_from_file():
         Path(temp_path).unlink()
 
 
+def test_config_load_from_toml_file():
+    """Test loading configuration from TOML file."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".toml", delete=False) as f:
+        f.write('[app]\nname = "Test"\n\n[logging]\nlevel = "DEBUG"\n')
+        temp_path = f.name
+
+    try:
+        config = Config.load(temp_path)
+
+        assert config.app.name == "Test"
+        assert config.logging.level == "DEBUG"
+
+        with pytest.raises(ValueError):
+            config.save()
+    finally:
+        Path(temp_path).unlink()
+
+
 def test_config_get():
     """Test getting configuration values."""
     config = Config()
@@ -63,6 +81,19 @@ def test_config_set():
     assert config.logging.level == "DEBUG"
 
 
+def test_config_get_reflects_set():
+    """Test that values changed with set() are seen by later get() calls."""
+    config = Config()
+
+    assert config.get("app.debug") is False
+    config.set("app.debug", True)
+    assert config.get("app.debug") is True
+
+    config.set("performance.max_workers", 2)
+    assert config.get("performance.max_workers") == 2
+    assert config.get("performance") == {"max_workers": 2}
+
+
 def test_config_validation():
     """Test configuration validation."""
     # Test invalid log level
@@ -86,3 +117,24 @@ def test_config_save():
         assert loaded_config.app.debug is True
     finally:
         Path(temp_path).unlink()
+
+
+def test_config_load_reparses_modified_file():
+    """Test that cached config parses are invalidated when the file changes."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+        yaml.dump({"app": {"name": "First"}}, f)
+        temp_path = f.name
+
+    try:
+        assert Config.load(temp_path).app.name == "First"
+
+        # Mutating a loaded config must not leak into the cached parse
+        Config.load(temp_path).set("app.name", "Mutated")
+        assert Config.load(temp_path).app.name == "First"
+
+        with open(temp_path, "w", encoding="utf-8") as f:
+            yaml.dump({"app": {"name": "Second", "version": "2.0.0"}}, f)
+
+        assert Config.load(temp_path).app.name == "Second"
+    finally:
+        Path(temp_path).unlink()
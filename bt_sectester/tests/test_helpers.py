@@ -5,11 +5,15 @@ Tests for utility helpers.
 import pytest
 
 from bt_sectester.utils.helpers import (
+    atomic_write_bytes,
     format_rssi,
     normalize_mac_address,
+    normalize_mac_addresses,
     parse_bluetooth_class,
+    parse_bluetooth_classes,
     sanitize_filename,
     validate_mac_address,
+    validate_mac_batch,
 )
 
 
@@ -25,6 +29,14 @@ def test_validate_mac_address():
     assert validate_mac_address("AA:BB:CC:DD:EE") is False
     assert validate_mac_address("ZZ:ZZ:ZZ:ZZ:ZZ:ZZ") is False
     assert validate_mac_address("not a mac") is False
+    assert validate_mac_address("AA:BB:CC:DD:EE:FF\n") is False
+
+
+def test_validate_mac_batch():
+    """Test batch MAC address validation."""
+    macs = ["AA:BB:CC:DD:EE:FF", "aa-bb-cc-dd-ee-ff", "AABBCCDDEEFF", "ZZ:ZZ:ZZ:ZZ:ZZ:ZZ"]
+    assert validate_mac_batch(macs) == [True, True, False, False]
+    assert validate_mac_batch([]) == []
 
 
 def test_normalize_mac_address():
@@ -34,6 +46,23 @@ def test_normalize_mac_address():
     assert normalize_mac_address("AABBCCDDEEFF") == "AA:BB:CC:DD:EE:FF"
 
 
+def test_normalize_mac_addresses():
+    """Test batch MAC address normalization."""
+    assert normalize_mac_addresses([]) == []
+    assert normalize_mac_addresses(["aa:bb:cc:dd:ee:ff", "01:02:03:04:05:0a"]) == [
+        "AA:BB:CC:DD:EE:FF",
+        "01:02:03:04:05:0A",
+    ]
+    assert normalize_mac_addresses(["aa-bb-cc-dd-ee-ff", "01-02-03-04-05-0a"]) == [
+        "AA:BB:CC:DD:EE:FF",
+        "01:02:03:04:05:0A",
+    ]
+
+    # Mixed separators fall back to per-address normalization
+    macs = ["aa:bb:cc:dd:ee:ff", "AA-BB-CC-DD-EE-01", "aabbccddee02"]
+    assert normalize_mac_addresses(macs) == [normalize_mac_address(mac) for mac in macs]
+
+
 def test_parse_bluetooth_class():
     """Test Bluetooth device class parsing."""
     # Example: Phone device class
@@ -46,6 +75,15 @@ def test_parse_bluetooth_class():
     assert "service_code" in parsed
 
 
+def test_parse_bluetooth_classes():
+    """Test batch Bluetooth device class parsing."""
+    parsed = parse_bluetooth_classes([0x5A020C, 0x1F00])
+
+    assert parsed[0] == ("Phone", 0x02, 0x03, 0x2D0)
+    assert parsed[1][0] == "Uncategorized"
+    assert parse_bluetooth_classes([]) == []
+
+
 def test_format_rssi():
     """Test RSSI formatting."""
     assert "Excellent" in format_rssi(-40)
@@ -61,3 +99,14 @@ def test_sanitize_filename():
     assert sanitize_filename("file:name") == "file_name"
     assert sanitize_filename("") == "unnamed"
     assert sanitize_filename("...") == "unnamed"
+
+
+def test_atomic_write_bytes(tmp_path):
+    """Test atomic file replacement."""
+    target = tmp_path / "session.json"
+    target.write_bytes(b"old")
+
+    atomic_write_bytes(target, b'{"devices": []}')
+
+    assert target.read_bytes() == b'{"devices": []}'
+    assert not (tmp_path / "session.json.tmp").exists()
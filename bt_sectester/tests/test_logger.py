@@ -7,7 +7,7 @@ from pathlib import Path
 
 import structlog
 
-from bt_sectester.utils.logger import AuditLogger, setup_logger
+from bt_sectester.utils.logger import AuditLogger, setup_logger, shutdown_logging
 
 
 def test_setup_logger():
@@ -38,6 +38,7 @@ def test_setup_logger_with_file():
         )
 
         logger.info("test message", key="value")
+        shutdown_logging()
 
         # Check file exists and has content
         assert log_file.exists()
@@ -64,6 +65,8 @@ def test_audit_logger():
             user="test_user",
             ethical_mode=True,
         )
+        # Entries are buffered; closing writes them out
+        audit_logger.close()
 
         # Check audit file
         assert audit_file.exists()
@@ -71,6 +74,12 @@ def test_audit_logger():
         assert "test_action" in content
         assert "test_user" in content
 
+        # Only entries logged by this instance are summarized
+        formatted = audit_logger.formatted_bytes()
+        assert formatted.count(b"\n") == 1
+        assert b"] test_action " in formatted
+        assert AuditLogger(audit_file).formatted_bytes() == b""
+
     finally:
         if audit_file.exists():
             audit_file.unlink()
@@ -1,6 +1,25 @@
 """Utility modules for bt-sec-analyzer."""
 
-from bt_sectester.utils.config import Config
-from bt_sectester.utils.logger import get_logger, setup_logger
+import importlib
+from typing import Any
+
+# Imported on first access so lightweight helpers (e.g. fastjson) can be
+# used without loading pydantic/yaml/structlog.
+_LAZY_ATTRIBUTES = {
+    "Config": "bt_sectester.utils.config",
+    "setup_logger": "bt_sectester.utils.logger",
+    "get_logger": "bt_sectester.utils.logger",
+}
 
 __all__ = ["Config", "setup_logger", "get_logger"]
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve lazily imported utility attributes."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
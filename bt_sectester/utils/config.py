@@ -4,14 +4,70 @@ Configuration management for bt-sec-analyzer.
 Handles loading, validation, and access to configuration settings.
 """
 
+import copy
 import os
+import tomllib
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, ClassVar, Dict, Optional
 
 import yaml
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 from pydantic_settings import BaseSettings
 
+# libyaml's C loader/dumper when PyYAML was built with it, else the pure-Python ones
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+_VALID_LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"})
+
+
+@lru_cache(maxsize=8)
+def _load_cached(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    Parse a YAML or TOML configuration file, memoized on its stat signature.
+
+    The mtime and size are part of the cache key so that edits to the file
+    invalidate the cached entry without any explicit bookkeeping. Files
+    ending in ".toml" are read with the stdlib tomllib parser.
+
+    Args:
+        path: Resolved path to the configuration file
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+
+    Returns:
+        Parsed configuration data (must not be mutated by callers)
+    """
+    if path.endswith(".toml"):
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
+
+
+def _flatten_into(flat: Dict[str, Any], prefix: str, value: Any) -> None:
+    """
+    Record every nested model field and dict key of a value under its dotted path.
+
+    Args:
+        flat: Mapping to fill with dotted key -> value entries
+        prefix: Dotted path of value, including the trailing "." (empty at the root)
+        value: Model, dict or leaf value to walk
+    """
+    if isinstance(value, BaseModel):
+        items = ((name, getattr(value, name)) for name in type(value).model_fields)
+    elif isinstance(value, dict):
+        items = value.items()
+    else:
+        return
+
+    for name, item in items:
+        key = f"{prefix}{name}"
+        flat[key] = item
+        _flatten_into(flat, f"{key}.", item)
+
 
 class AppConfig(BaseModel):
     """Application-level configuration."""
@@ -29,14 +85,16 @@ class LoggingConfig(BaseModel):
     format: str = "json"
     output: Dict[str, Any] = Field(default_factory=dict)
     audit: Dict[str, Any] = Field(default_factory=dict)
+    websocket: Dict[str, Any] = Field(default_factory=dict)
 
-    @validator("level")
+    @field_validator("level")
+    @classmethod
     def validate_level(cls, v: str) -> str:
         """Validate log level."""
-        valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if v.upper() not in valid_levels:
+        level = v.upper()
+        if level not in _VALID_LOG_LEVELS:
             raise ValueError(f"Invalid log level: {v}")
-        return v.upper()
+        return level
 
 
 class BluetoothConfig(BaseModel):
@@ -47,6 +105,7 @@ class BluetoothConfig(BaseModel):
     classic_enabled: bool = True
     ble_enabled: bool = True
     auto_detect_adapters: bool = True
+    max_devices: int = 10000
 
 
 class AttacksConfig(BaseModel):
@@ -85,8 +144,11 @@ class Config(BaseSettings):
     session: Dict[str, Any] = Field(default_factory=dict)
     ui: Dict[str, Any] = Field(default_factory=dict)
 
-    _instance: Optional["Config"] = None
-    _config_path: Optional[Path] = None
+    _instance: ClassVar[Optional["Config"]] = None
+    _config_path: ClassVar[Optional[Path]] = None
+
+    # Dotted key -> value lookup table, built on first get() and reset by set()
+    _flat: Optional[Dict[str, Any]] = PrivateAttr(default=None)
 
     class Config:
         """Pydantic configuration."""
@@ -96,7 +158,10 @@ class Config(BaseSettings):
     @classmethod
     def load(cls, config_path: Optional[str] = None) -> "Config":
         """
-        Load configuration from YAML file.
+        Load configuration from a YAML or TOML file.
+
+        Parsed file contents are cached keyed on path, mtime and size, so
+        repeated loads of an unchanged file skip the read and YAML parse.
 
         Args:
             config_path: Path to configuration file. Defaults to configs/config.yaml
@@ -104,9 +169,6 @@ class Config(BaseSettings):
         Returns:
             Config instance
         """
-        if cls._instance is not None:
-            return cls._instance
-
         if config_path is None:
             # Try to find config file
             base_dir = Path(__file__).parent.parent.parent
@@ -123,8 +185,10 @@ class Config(BaseSettings):
             cls._instance = cls()
             return cls._instance
 
-        with open(config_file, "r", encoding="utf-8") as f:
-            config_data = yaml.safe_load(f)
+        stat = config_file.stat()
+        config_data = copy.deepcopy(
+            _load_cached(str(config_file.resolve()), stat.st_mtime_ns, stat.st_size)
+        )
 
         cls._instance = cls(**config_data)
         cls._config_path = config_file
@@ -141,6 +205,10 @@ class Config(BaseSettings):
         """
         Get configuration value by dot notation.
 
+        Lookups go through a flat table of every dotted key, built on the
+        first call. Changes made with set() are picked up; values assigned
+        directly on the model or its dicts are not.
+
         Args:
             key: Configuration key (e.g., "logging.level")
             default: Default value if key not found
@@ -148,18 +216,15 @@ class Config(BaseSettings):
         Returns:
             Configuration value
         """
-        keys = key.split(".")
-        value = self
-
-        for k in keys:
-            if hasattr(value, k):
-                value = getattr(value, k)
-            elif isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
+        # Read the private slot directly; self._flat resolves through
+        # BaseModel.__getattr__, which costs more than the lookup itself
+        flat = self.__pydantic_private__["_flat"]
+        if flat is None:
+            flat = {}
+            _flatten_into(flat, "", self)
+            self._flat = flat
 
-        return value
+        return flat.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
         """
@@ -186,12 +251,18 @@ class Config(BaseSettings):
         else:
             setattr(obj, final_key, value)
 
+        self._flat = None
+
     def save(self, output_path: Optional[str] = None) -> None:
         """
         Save configuration to YAML file.
 
         Args:
             output_path: Output file path
+
+        Raises:
+            ValueError: If no path is known or the path is a TOML file
+                (only YAML can be written)
         """
         if output_path is None:
             if self._config_path:
@@ -200,25 +271,12 @@ class Config(BaseSettings):
                 raise ValueError("No output path specified")
 
         output_file = Path(output_path)
+        if output_file.suffix == ".toml":
+            raise ValueError(f"Cannot save configuration as TOML: {output_file}")
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        config_dict = self.dict()
+        config_dict = self.model_dump()
         with open(output_file, "w", encoding="utf-8") as f:
-            yaml.dump(config_dict, f, default_flow_style=False, sort_keys=False)
-
-    def dict(self, **kwargs: Any) -> Dict[str, Any]:
-        """Convert to dictionary."""
-        return {
-            "app": self.app.dict(),
-            "logging": self.logging.dict(),
-            "bluetooth": self.bluetooth.dict(),
-            "attacks": self.attacks.dict(),
-            "ollama": self.ollama.dict(),
-            "performance": self.performance,
-            "tools": self.tools,
-            "privileges": self.privileges,
-            "reporting": self.reporting,
-            "scanning": self.scanning,
-            "session": self.session,
-            "ui": self.ui,
-        }
+            yaml.dump(
+                config_dict, f, Dumper=_YAML_DUMPER, default_flow_style=False, sort_keys=False
+            )
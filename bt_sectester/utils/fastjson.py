@@ -0,0 +1,72 @@
+"""
+Fast JSON serialization for bt-sec-analyzer.
+
+Uses orjson when it is installed and falls back to the standard library.
+Both paths accept datetime, date and Enum values, which orjson encodes natively.
+"""
+
+import json
+from datetime import date
+from enum import Enum
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Encode the extra types orjson supports for the standard library encoder."""
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON.
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with two-space indentation
+        default: Called with objects of any other type, returning a
+            serializable value (TypeError is raised for them if None)
+
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+
+    fallback = _default
+    if default is not None:
+
+        def fallback(value: Any) -> Any:
+            try:
+                return _default(value)
+            except TypeError:
+                return default(value)
+
+    return json.dumps(obj, indent=2 if indent else None, default=fallback).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Deserialize a JSON document.
+
+    Args:
+        data: JSON document as bytes or str
+
+    Returns:
+        Deserialized object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
@@ -2,14 +2,32 @@
 Helper utilities for bt-sec-analyzer.
 """
 
+import os
 import re
+import shutil
 import subprocess
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from bt_sectester.utils.logger import LoggerMixin
 
 
+# Six hex octets separated by ':' or '-'; bound once for the hot paths below.
+# A single compiled fullmatch is faster here than per-character checks in
+# Python (set membership over the encoded bytes, or str.translate)
+_MAC_FULLMATCH = re.compile(r"(?:[0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}").fullmatch
+
+# Characters not allowed in filenames on common filesystems
+_INVALID_FILENAME_CHARS_SUB = re.compile(r'[<>:"/\\|?*]').sub
+
+# An adapter block of hciconfig output: the unindented "hciN:" line and the
+# indented detail lines below it
+_HCICONFIG_ADAPTER = re.compile(r"^([^:\s][^:\n]*):[^\n]*((?:\n[ \t][^\n]*)*)", re.MULTILINE)
+_HCICONFIG_ADDRESS = re.compile(r"BD Address:\s*(\S+)")
+
+
 def validate_mac_address(mac: str) -> bool:
     """
     Validate Bluetooth MAC address format.
@@ -20,8 +38,21 @@ def validate_mac_address(mac: str) -> bool:
     Returns:
         True if valid format
     """
-    pattern = r"^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$"
-    return bool(re.match(pattern, mac))
+    return len(mac) == 17 and _MAC_FULLMATCH(mac) is not None
+
+
+def validate_mac_batch(macs: List[str]) -> List[bool]:
+    """
+    Validate many MAC addresses in one pass.
+
+    Args:
+        macs: MAC address strings
+
+    Returns:
+        Validity of each address, in input order
+    """
+    match = _MAC_FULLMATCH
+    return [len(mac) == 17 and match(mac) is not None for mac in macs]
 
 
 def normalize_mac_address(mac: str) -> str:
@@ -34,50 +65,149 @@ def normalize_mac_address(mac: str) -> str:
     Returns:
         Normalized MAC address
     """
-    # Remove any separators and convert to uppercase
-    cleaned = mac.replace(":", "").replace("-", "").upper()
+    # Fast paths for the two separated forms: only the case (and the
+    # separator) change, so no splitting or re-joining is needed
+    if len(mac) == 17:
+        separators = mac[2::3]
+        if separators == ":::::" and mac.count(":") == 5 and "-" not in mac:
+            return mac.upper()
+        if separators == "-----" and mac.count("-") == 5 and ":" not in mac:
+            return mac.replace("-", ":").upper()
+
+    # Remove any separators and convert to uppercase. Chained replace() is
+    # faster than one str.translate table here: replace() returns the string
+    # itself when there is nothing to remove, and upper() is ASCII-optimized
+    c = mac.replace(":", "").replace("-", "").upper()
 
     # Add colons
-    return ":".join(cleaned[i : i + 2] for i in range(0, 12, 2))
+    return f"{c[0:2]}:{c[2:4]}:{c[4:6]}:{c[6:8]}:{c[8:10]}:{c[10:12]}"
 
 
-def parse_bluetooth_class(device_class: int) -> Dict[str, str]:
+def normalize_mac_addresses(macs: List[str]) -> List[str]:
     """
-    Parse Bluetooth device class to human-readable format.
+    Normalize many MAC addresses at once.
+
+    When every address uses the same separator ("AA:BB:..." or
+    "AA-BB-..."), the batch is joined into one string and checked,
+    converted and split with single C-level string operations instead of
+    a Python call per address. Mixed batches fall back to
+    normalize_mac_address for each address.
 
     Args:
-        device_class: Device class integer
+        macs: MAC address strings
 
     Returns:
-        Dictionary with device type information
-    """
-    # Major device classes
-    major_classes = {
-        0x00: "Miscellaneous",
-        0x01: "Computer",
-        0x02: "Phone",
-        0x03: "LAN/Network Access Point",
-        0x04: "Audio/Video",
-        0x05: "Peripheral",
-        0x06: "Imaging",
-        0x07: "Wearable",
-        0x08: "Toy",
-        0x09: "Health",
-        0x1F: "Uncategorized",
-    }
+        Normalized MAC addresses, in input order
+    """
+    if not macs:
+        return []
+
+    count = len(macs)
+    joined = "\n".join(macs)
+    # With 17-char addresses, records are 18 chars apart (a multiple of 3),
+    # so [2::3] visits exactly the five separators and the newline of each
+    if len(joined) == 18 * count - 1 and joined.count("\n") == count - 1:
+        separators = joined[2::3]
+        if (
+            separators == (":::::\n" * count)[:-1]
+            and joined.count(":") == 5 * count
+            and "-" not in joined
+        ):
+            return joined.upper().split("\n")
+        if (
+            separators == ("-----\n" * count)[:-1]
+            and joined.count("-") == 5 * count
+            and ":" not in joined
+        ):
+            return joined.replace("-", ":").upper().split("\n")
+
+    return [normalize_mac_address(mac) for mac in macs]
+
+
+# Major device classes
+_MAJOR_DEVICE_CLASSES = {
+    0x00: "Miscellaneous",
+    0x01: "Computer",
+    0x02: "Phone",
+    0x03: "LAN/Network Access Point",
+    0x04: "Audio/Video",
+    0x05: "Peripheral",
+    0x06: "Imaging",
+    0x07: "Wearable",
+    0x08: "Toy",
+    0x09: "Health",
+    0x1F: "Uncategorized",
+}
+
+
+@lru_cache(maxsize=1024)
+def parse_bluetooth_class_tuple(device_class: int) -> Tuple[str, int, int, int]:
+    """
+    Parse Bluetooth device class, memoized (real scans repeat a few classes).
 
+    Args:
+        device_class: Device class integer
+
+    Returns:
+        (major class name, major code, minor code, service code)
+    """
     major = (device_class >> 8) & 0x1F
-    minor = (device_class >> 2) & 0x3F
-    service = (device_class >> 13) & 0x7FF
+    return (
+        _MAJOR_DEVICE_CLASSES.get(major, "Unknown"),
+        major,
+        (device_class >> 2) & 0x3F,
+        (device_class >> 13) & 0x7FF,
+    )
+
+
+def parse_bluetooth_classes(device_classes: List[int]) -> List[Tuple[str, int, int, int]]:
+    """
+    Parse many Bluetooth device classes at once.
+
+    Args:
+        device_classes: Device class integers
 
+    Returns:
+        parse_bluetooth_class_tuple() of each class, in input order
+    """
+    return list(map(parse_bluetooth_class_tuple, device_classes))
+
+
+def parse_bluetooth_class(device_class: int) -> Dict[str, str]:
+    """
+    Parse Bluetooth device class to human-readable format.
+
+    Args:
+        device_class: Device class integer
+
+    Returns:
+        Dictionary with device type information (a new one on every call)
+    """
+    major_class, major, minor, service = parse_bluetooth_class_tuple(device_class)
     return {
-        "major_class": major_classes.get(major, "Unknown"),
+        "major_class": major_class,
         "major_code": major,
         "minor_code": minor,
         "service_code": service,
     }
 
 
+@lru_cache(maxsize=256)
+def _which(tool_name: str, search_path: Optional[str]) -> Optional[str]:
+    """
+    Locate an executable on a search path, memoized per tool and path.
+
+    Args:
+        tool_name: Name of the tool
+        search_path: PATH value to search (part of the key so changes to
+            PATH are honored)
+
+    Returns:
+        Full path of the tool, or None if not found
+    """
+    return shutil.which(tool_name, path=search_path)
+
+
 def check_tool_availability(tool_name: str, tool_path: Optional[str] = None) -> bool:
     """
     Check if an external tool is available.
@@ -89,19 +219,10 @@ def check_tool_availability(tool_name: str, tool_path: Optional[str] = None) ->
     Returns:
         True if tool is available
     """
-    try:
-        if tool_path and Path(tool_path).exists():
-            return True
+    if tool_path and Path(tool_path).exists():
+        return True
 
-        result = subprocess.run(
-            ["which", tool_name],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        return result.returncode == 0
-    except Exception:
-        return False
+    return _which(tool_name, os.environ.get("PATH")) is not None
 
 
 def get_bluetooth_adapters() -> List[Dict[str, str]]:
@@ -124,30 +245,24 @@ def get_bluetooth_adapters() -> List[Dict[str, str]]:
         if result.returncode != 0:
             return adapters
 
-        # Parse hciconfig output
-        current_adapter = None
-        for line in result.stdout.split("\n"):
-            if line and not line.startswith("\t"):
-                # New adapter line
-                parts = line.split(":")
-                if parts:
-                    adapter_name = parts[0].strip()
-                    current_adapter = {
-                        "name": adapter_name,
-                        "address": "",
-                        "type": "",
-                        "status": "",
-                    }
-                    adapters.append(current_adapter)
-            elif current_adapter and line.strip():
-                # Adapter details
-                if "BD Address:" in line:
-                    address = line.split("BD Address:")[1].split()[0].strip()
-                    current_adapter["address"] = address
-                elif "UP RUNNING" in line:
-                    current_adapter["status"] = "up"
-                elif "DOWN" in line:
-                    current_adapter["status"] = "down"
+        # Parse hciconfig output, one block per adapter
+        for match in _HCICONFIG_ADAPTER.finditer(result.stdout):
+            details = match.group(2)
+            address = _HCICONFIG_ADDRESS.search(details)
+            if "UP RUNNING" in details:
+                status = "up"
+            elif "DOWN" in details:
+                status = "down"
+            else:
+                status = ""
+            adapters.append(
+                {
+                    "name": match.group(1).strip(),
+                    "address": address.group(1) if address else "",
+                    "type": "",
+                    "status": status,
+                }
+            )
 
     except Exception:
         pass
@@ -155,6 +270,23 @@ def get_bluetooth_adapters() -> List[Dict[str, str]]:
     return adapters
 
 
+def format_timestamp_ns(timestamp_ns: int) -> str:
+    """
+    Format a Unix timestamp in nanoseconds as an ISO 8601 UTC string.
+
+    Args:
+        timestamp_ns: Nanoseconds since the epoch (e.g. time.time_ns())
+
+    Returns:
+        Timestamp string such as 2026-02-17T12:00:00.000000
+    """
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)) + f".{nanoseconds // 1000:06d}"
+
+
+# RSSI readings span only a couple hundred integer dBm values, so every
+# formatted string fits in the cache
+@lru_cache(maxsize=256)
 def format_rssi(rssi: int) -> str:
     """
     Format RSSI value with signal strength indicator.
@@ -197,13 +329,39 @@ class CommandExecutor(LoggerMixin):
         Returns:
             Tuple of (return_code, stdout, stderr)
         """
-        self.logger.debug("Executing command", command=" ".join(command))
+        return_code, stdout, stderr = self.execute_bytes(command, timeout, capture_output)
+        return (
+            return_code,
+            stdout.decode("utf-8", "replace"),
+            stderr.decode("utf-8", "replace"),
+        )
+
+    def execute_bytes(
+        self,
+        command: List[str],
+        timeout: int = 30,
+        capture_output: bool = True,
+    ) -> Tuple[int, bytes, bytes]:
+        """
+        Execute a command, returning its output undecoded.
+
+        For callers that scan large outputs as bytes (e.g. with compiled
+        bytes patterns), which skips decoding the whole capture.
+
+        Args:
+            command: Command and arguments
+            timeout: Timeout in seconds
+            capture_output: Whether to capture stdout/stderr
+
+        Returns:
+            Tuple of (return_code, stdout, stderr)
+        """
+        self.logger.debug("Executing command", command=command)
 
         try:
             result = subprocess.run(
                 command,
                 capture_output=capture_output,
-                text=True,
                 timeout=timeout,
             )
 
@@ -215,8 +373,8 @@ class CommandExecutor(LoggerMixin):
 
             return (
                 result.returncode,
-                result.stdout if capture_output else "",
-                result.stderr if capture_output else "",
+                result.stdout if capture_output else b"",
+                result.stderr if capture_output else b"",
             )
 
         except subprocess.TimeoutExpired:
@@ -237,6 +395,31 @@ def ensure_directory(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """
+    Write a file atomically.
+
+    The data goes to a sibling temporary file in one write, is flushed to
+    disk, and is then renamed over the target, so readers never see a
+    partially written file.
+
+    Args:
+        path: Destination file path
+        data: File contents
+    """
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        os.fdatasync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize a filename by removing invalid characters.
@@ -248,7 +431,7 @@ def sanitize_filename(filename: str) -> str:
         Sanitized filename
     """
     # Remove invalid characters
-    sanitized = re.sub(r'[<>:"/\\|?*]', "_", filename)
+    sanitized = _INVALID_FILENAME_CHARS_SUB("_", filename)
     # Remove leading/trailing whitespace and dots
     sanitized = sanitized.strip(". ")
     return sanitized or "unnamed"
@@ -4,29 +4,124 @@ Structured logging system for bt-sec-analyzer.
 Provides JSON-structured logging with rotation, audit trails, and UI integration.
 """
 
-import json
+import atexit
 import logging
+import os
+import queue
 import sys
-from datetime import datetime
-from logging.handlers import RotatingFileHandler
+import threading
+import time
+import weakref
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, ClassVar, Deque, Dict, Iterator, Optional
 
 import structlog
 
+from bt_sectester.utils import fastjson
+
+# Set to any non-empty value to write log records synchronously and unbuffered
+UNBUFFERED_ENV_VAR = "BT_LOG_UNBUFFERED"
+
+_listener: Optional[QueueListener] = None
+
+# Audit loggers still alive, so buffered entries are written out at exit
+_audit_loggers: "weakref.WeakSet[AuditLogger]" = weakref.WeakSet()
+
+
+def _render_json(event_dict: Dict[str, Any], **kwargs: Any) -> str:
+    """
+    Serialize a log event for structlog's JSONRenderer using fastjson.
+
+    Args:
+        event_dict: Event to serialize
+        **kwargs: Options from JSONRenderer; only "default" is honored
+
+    Returns:
+        JSON text (stdlib handlers expect str, not bytes)
+    """
+    return fastjson.dumps(event_dict, default=kwargs.get("default")).decode("utf-8")
+
+
+_render_stack_info = structlog.processors.StackInfoRenderer()
+
+
+def _render_exception_info(
+    logger: Any, method_name: str, event_dict: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Render stack_info and exc_info, skipping both when neither was requested.
+
+    Running StackInfoRenderer and format_exc_info unconditionally costs close
+    to a microsecond per record; almost no record carries either key.
+
+    Args:
+        logger: Wrapped logger
+        method_name: Name of the logging method called
+        event_dict: Event being processed
+
+    Returns:
+        Processed event
+    """
+    if "exc_info" not in event_dict and "stack_info" not in event_dict:
+        return event_dict
+    event_dict = _render_stack_info(logger, method_name, event_dict)
+    return structlog.processors.format_exc_info(logger, method_name, event_dict)
+
 
 class AuditLogger:
     """Dedicated audit logger for security-sensitive operations."""
 
-    def __init__(self, audit_file: Path):
+    def __init__(
+        self,
+        audit_file: Path,
+        buffer_size: int = 32 * 1024,
+        flush_interval: float = 0.1,
+    ):
         """
         Initialize audit logger.
 
+        Entries are appended to an in-memory buffer and written through one
+        open file handle once buffer_size bytes are pending or flush_interval
+        seconds have passed, whichever comes first.
+
         Args:
             audit_file: Path to audit log file
+            buffer_size: Pending bytes that trigger an immediate write
+            flush_interval: Maximum seconds an entry may sit in the buffer
         """
         self.audit_file = audit_file
         self.audit_file.parent.mkdir(parents=True, exist_ok=True)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._pending = bytearray()
+        self._file: Optional[BinaryIO] = None
+        self._flush_timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        # (second, "YYYY-MM-DDTHH:MM:SS") of the last whole second logged, so
+        # bursts only format the microseconds; one tuple keeps it thread-safe
+        self._timestamp_cache = (-1, "")
+        # Where this instance's entries start in the (shared) audit file
+        try:
+            self._start_offset = self.audit_file.stat().st_size
+        except FileNotFoundError:
+            self._start_offset = 0
+        _audit_loggers.add(self)
+
+    def _timestamp(self) -> str:
+        """
+        Get the current UTC time as an ISO 8601 string.
+
+        Returns:
+            Timestamp with microseconds, e.g. "2026-02-17T12:00:00.123456"
+        """
+        second, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+        cached = self._timestamp_cache
+        if cached[0] != second:
+            cached = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+            self._timestamp_cache = cached
+        return f"{cached[1]}.{nanoseconds // 1000:06d}"
 
     def log_action(
         self,
@@ -45,31 +140,222 @@ class AuditLogger:
             ethical_mode: Whether ethical mode is enabled
         """
         entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self._timestamp(),
             "action": action,
             "user": user,
             "ethical_mode": ethical_mode,
             "details": details or {},
         }
 
-        with open(self.audit_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry) + "\n")
+        encoded_entry = fastjson.dumps(entry)
+
+        with self._lock:
+            self._pending += encoded_entry
+            self._pending += b"\n"
+
+            if len(self._pending) >= self.buffer_size:
+                self._write_pending()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _write_pending(self) -> None:
+        """Write buffered entries to the audit file. Called with the lock held."""
+        if not self._pending:
+            return
+        if self._file is None:
+            self._file = open(self.audit_file, "ab")
+        self._file.write(self._pending)
+        self._file.flush()
+        self._pending.clear()
+
+    def flush(self) -> None:
+        """Write buffered entries to the audit file."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._write_pending()
+
+    def close(self) -> None:
+        """Write buffered entries and close the audit file (reopened if logged to again)."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._write_pending()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def formatted_bytes(self) -> bytes:
+        """
+        Get the entries logged by this instance as preformatted text.
+
+        Built from the audit file on each call, so logging never pays for it.
+
+        Returns:
+            UTF-8 encoded "[timestamp] action details" lines
+        """
+        formatted = bytearray()
+        for line in self.iter_raw_entries(self._start_offset):
+            entry = fastjson.loads(line)
+            formatted += f"[{entry.get('timestamp', '')}] {entry.get('action', '')} ".encode()
+            formatted += fastjson.dumps(entry.get("details", {}))
+            formatted += b"\n"
+        return bytes(formatted)
+
+    def size(self) -> int:
+        """Get the current size of the audit trail in bytes."""
+        self.flush()
+        try:
+            return self.audit_file.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def iter_raw_entries(self, offset: int = 0) -> Iterator[bytes]:
+        """
+        Stream audit entries as raw JSON lines without parsing them.
+
+        Args:
+            offset: Byte offset to start reading from (e.g. a prior size())
+
+        Yields:
+            One JSON-encoded entry per line
+        """
+        self.flush()
+        if not self.audit_file.exists():
+            return
+
+        with open(self.audit_file, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler that batches writes instead of flushing per record."""
+
+    def __init__(
+        self,
+        filename: Path,
+        maxBytes: int = 0,
+        backupCount: int = 0,
+        buffer_size: int = 64 * 1024,
+        flush_interval: float = 1.0,
+    ):
+        """
+        Initialize buffered file handler.
+
+        Args:
+            filename: Path to log file
+            maxBytes: Rotate when the file would exceed this size (0 disables)
+            backupCount: Number of rotated files to keep
+            buffer_size: Size of the underlying write buffer in bytes
+            flush_interval: Maximum seconds a record may sit in the buffer
+        """
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._size = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding="utf-8")
+
+    def _open(self):
+        stream = open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+        self._size = stream.seek(0, os.SEEK_END)
+        return stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Write a record into the buffer, rotating first if needed.
+
+        Called with the handler lock held. Size tracking is done in-process
+        (character count) so rotation checks never force the buffer out with
+        a seek.
+
+        Args:
+            record: Log record to emit
+        """
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self._size + len(msg) >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self._size += len(msg)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        """Flush buffered records to disk."""
+        with self.lock:
+            self._flush_timer = None
+            if self.stream and hasattr(self.stream, "flush"):
+                self.stream.flush()
+
+    def close(self) -> None:
+        """Cancel any pending timer, flush and close the file."""
+        with self.lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        super().close()
+
+
+class _RecordQueueHandler(QueueHandler):
+    """Queue handler that skips re-formatting records structlog already rendered."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Prepare a record for the queue.
+
+        structlog hands over the finished message with no arguments, so the
+        stock copy-and-format step (several microseconds on the emitting
+        thread) only matters for plain stdlib records with args or exc_info.
+
+        Args:
+            record: Record being logged
+
+        Returns:
+            Record to enqueue
+        """
+        if record.args or record.exc_info or record.stack_info:
+            return super().prepare(record)
+        return record
 
 
 class UILogHandler(logging.Handler):
     """Custom handler to send logs to UI in real-time."""
 
-    def __init__(self, callback: Optional[callable] = None):
+    def __init__(self, callback: Optional[callable] = None, max_buffer_size: int = 1000):
         """
         Initialize UI log handler.
 
         Args:
             callback: Function to call with log records (for UI updates)
+            max_buffer_size: Most recent records kept for get_buffer()
         """
         super().__init__()
         self.callback = callback
-        self.buffer = []
-        self.max_buffer_size = 1000
+        self.max_buffer_size = max_buffer_size
+        # Oldest records fall off the front as new ones are appended
+        self.buffer: Deque[str] = deque(maxlen=max_buffer_size)
 
     def emit(self, record: logging.LogRecord) -> None:
         """
@@ -82,10 +368,6 @@ class UILogHandler(logging.Handler):
             log_entry = self.format(record)
             self.buffer.append(log_entry)
 
-            # Keep buffer size manageable
-            if len(self.buffer) > self.max_buffer_size:
-                self.buffer = self.buffer[-self.max_buffer_size :]
-
             # Send to UI if callback is set
             if self.callback:
                 self.callback(log_entry)
@@ -94,7 +376,7 @@ class UILogHandler(logging.Handler):
 
     def get_buffer(self) -> list:
         """Get current log buffer."""
-        return self.buffer.copy()
+        return list(self.buffer)
 
     def clear_buffer(self) -> None:
         """Clear log buffer."""
@@ -123,8 +405,14 @@ def setup_logger(
     Returns:
         Configured structured logger
     """
+    global _listener
+
     # Convert level string to logging constant
     log_level = getattr(logging, level.upper(), logging.INFO)
+    unbuffered = bool(os.environ.get(UNBUFFERED_ENV_VAR))
+
+    # Stop a listener left over from a previous setup so its handlers are flushed
+    shutdown_logging()
 
     # Configure standard library logging
     logging.basicConfig(
@@ -136,6 +424,7 @@ def setup_logger(
     # Get root logger
     root_logger = logging.getLogger()
     root_logger.handlers.clear()  # Remove default handlers
+    root_logger.setLevel(log_level)
 
     # Setup handlers
     handlers = []
@@ -149,9 +438,14 @@ def setup_logger(
     # File handler with rotation
     if log_file:
         log_file.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = RotatingFileHandler(
-            log_file, maxBytes=10 * 1024 * 1024, backupCount=5  # 10MB
-        )
+        if unbuffered:
+            file_handler = RotatingFileHandler(
+                log_file, maxBytes=10 * 1024 * 1024, backupCount=5  # 10MB
+            )
+        else:
+            file_handler = BufferedRotatingFileHandler(
+                log_file, maxBytes=10 * 1024 * 1024, backupCount=5  # 10MB
+            )
         file_handler.setLevel(log_level)
         handlers.append(file_handler)
 
@@ -161,42 +455,75 @@ def setup_logger(
         ui_handler.setLevel(log_level)
         handlers.append(ui_handler)
 
-    # Add handlers to root logger
-    for handler in handlers:
-        root_logger.addHandler(handler)
+    # Add handlers to root logger, behind a queue unless running unbuffered
+    if unbuffered:
+        for handler in handlers:
+            root_logger.addHandler(handler)
+    elif handlers:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        root_logger.addHandler(_RecordQueueHandler(log_queue))
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
 
     # Configure structlog processors
+    # Level filtering happens in the wrapper class below, so calls under the
+    # configured level return before any processor runs
     processors = [
-        structlog.stdlib.filter_by_level,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
         structlog.stdlib.PositionalArgumentsFormatter(),
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
+        _render_exception_info,
         structlog.processors.UnicodeDecoder(),
     ]
 
     # Add JSON or console renderer based on format
     if log_format == "json":
-        processors.append(structlog.processors.JSONRenderer())
+        processors.append(structlog.processors.JSONRenderer(serializer=_render_json))
     else:
         processors.append(structlog.dev.ConsoleRenderer())
 
     # Configure structlog
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.stdlib.BoundLogger,
+        wrapper_class=structlog.make_filtering_bound_logger(log_level),
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
+    # Loggers handed out before this call keep the old configuration
+    LoggerMixin._class_loggers.clear()
 
     # Get and return logger
     logger = structlog.get_logger(name)
     return logger
 
 
+def shutdown_logging() -> None:
+    """Stop the background log listener, writing out and closing its handlers."""
+    global _listener
+
+    if _listener is None:
+        return
+
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def _close_audit_loggers() -> None:
+    """Write out and close every live audit logger."""
+    for audit_logger in list(_audit_loggers):
+        audit_logger.close()
+
+
+atexit.register(_close_audit_loggers)
+
+
 def get_logger(name: Optional[str] = None) -> structlog.BoundLogger:
     """
     Get a logger instance.
@@ -213,9 +540,17 @@ def get_logger(name: Optional[str] = None) -> structlog.BoundLogger:
 class LoggerMixin:
     """Mixin class to add logging capabilities to any class."""
 
+    # Empty so slotted subclasses stay dict-free
+    __slots__ = ()
+
+    # One logger per class, shared by all its instances (reset by setup_logger)
+    _class_loggers: ClassVar[Dict[type, structlog.BoundLogger]] = {}
+
     @property
     def logger(self) -> structlog.BoundLogger:
         """Get logger for this class."""
-        if not hasattr(self, "_logger"):
-            self._logger = get_logger(self.__class__.__name__)
-        return self._logger
+        cls = type(self)
+        logger = LoggerMixin._class_loggers.get(cls)
+        if logger is None:
+            logger = LoggerMixin._class_loggers[cls] = get_logger(cls.__name__)
+        return logger
@@ -0,0 +1,113 @@
+"""
+Elevated command worker for bt-sec-analyzer.
+
+Started once under pkexec/sudo by PrivilegeManager so that a session of
+privileged commands pays for elevation (and any password prompt) only once.
+
+Runs as a standalone script with the standard library only: pkexec and sudo
+reset the environment, so the package may not be importable as root.
+
+Protocol (stdin/stdout, each frame a 4-byte big-endian length and a JSON
+object):
+    worker -> parent: {"ready": true} once started
+    parent -> worker: {"command": [...], "timeout": 60,
+                       "stdout": "pipe" | "devnull",
+                       "stderr": "pipe" | "devnull" | "stdout"}
+    worker -> parent: {"returncode": int, "stdout": str, "stderr": str}
+                      or {"error": "timeout" | "failed", "message": str}
+
+Commands are run without a shell. The worker exits when stdin is closed.
+"""
+
+import json
+import struct
+import subprocess
+import sys
+
+_LENGTH = struct.Struct(">I")
+
+_DESTINATIONS = {
+    "pipe": subprocess.PIPE,
+    "devnull": subprocess.DEVNULL,
+    "stdout": subprocess.STDOUT,
+}
+
+
+def read_frame(stream) -> object:
+    """
+    Read one frame from a binary stream.
+
+    Args:
+        stream: Binary stream to read from
+
+    Returns:
+        Decoded JSON object, or None at end of stream
+    """
+    header = stream.read(_LENGTH.size)
+    if len(header) < _LENGTH.size:
+        return None
+    (length,) = _LENGTH.unpack(header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    return json.loads(payload)
+
+
+def write_frame(stream, message: object) -> None:
+    """
+    Write one frame to a binary stream and flush it.
+
+    Args:
+        stream: Binary stream to write to
+        message: JSON-serializable object
+    """
+    payload = json.dumps(message).encode("utf-8")
+    stream.write(_LENGTH.pack(len(payload)) + payload)
+    stream.flush()
+
+
+def run_request(request: dict) -> dict:
+    """
+    Run one requested command.
+
+    Args:
+        request: Decoded request frame
+
+    Returns:
+        Response frame
+    """
+    try:
+        result = subprocess.run(
+            [str(arg) for arg in request["command"]],
+            stdin=subprocess.DEVNULL,
+            stdout=_DESTINATIONS[request.get("stdout", "pipe")],
+            stderr=_DESTINATIONS[request.get("stderr", "pipe")],
+            timeout=request.get("timeout", 60),
+        )
+    except subprocess.TimeoutExpired as e:
+        return {"error": "timeout", "message": str(e)}
+    except Exception as e:
+        return {"error": "failed", "message": str(e)}
+
+    return {
+        "returncode": result.returncode,
+        "stdout": (result.stdout or b"").decode("utf-8", "replace"),
+        "stderr": (result.stderr or b"").decode("utf-8", "replace"),
+    }
+
+
+def main() -> None:
+    """Serve requests from stdin until it is closed."""
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+
+    write_frame(stdout, {"ready": True})
+    while True:
+        request = read_frame(stdin)
+        if request is None:
+            return
+        write_frame(stdout, run_request(request))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,25 @@ Privilege escalation utilities for bt-sec-analyzer.
 Handles sudo/pkexec operations securely with user prompts.
 """
 
+import grp
 import os
 import shutil
 import subprocess
+import sys
+import threading
+import time
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
+from bt_sectester.utils import priv_worker
 from bt_sectester.utils.logger import LoggerMixin
 
+# Run as a script (not with -m) because elevation resets the environment
+_WORKER_PATH = str(Path(priv_worker.__file__).resolve())
+
+# Output destinations the elevated session can honor, by worker name
+_SESSION_STREAMS = {subprocess.PIPE: "pipe", subprocess.DEVNULL: "devnull"}
+
 
 class PrivilegeError(Exception):
     """Exception raised for privilege escalation errors."""
@@ -28,12 +39,26 @@ class PrivilegeManager(LoggerMixin):
 
         Args:
             method: Elevation method (pkexec, sudo, or none)
-            cache_timeout: Sudo cache timeout in seconds
+            cache_timeout: Seconds the elevated session may sit idle before it
+                is stopped, so the next command authenticates again (as with
+                the sudo/polkit credential cache)
         """
         self.method = method
         self.cache_timeout = cache_timeout
+        # Fixed for the life of the process, so looked up once
+        self._is_root = os.geteuid() == 0
+        self._bluetooth_permitted: Optional[bool] = None
         self._validate_method()
 
+        # Elevated worker shared by execute_privileged calls, started on first use
+        self._session: Optional[subprocess.Popen] = None
+        self._session_lock = threading.Lock()
+        self._session_unavailable = False
+        # Monotonic time of the last session request, and the timer that
+        # stops the session once it has been idle for cache_timeout
+        self._session_last_used = 0.0
+        self._idle_timer: Optional[threading.Timer] = None
+
     def _validate_method(self) -> None:
         """Validate that the elevation method is available."""
         if self.method == "none":
@@ -50,7 +75,7 @@ class PrivilegeManager(LoggerMixin):
 
     def is_root(self) -> bool:
         """Check if running as root."""
-        return os.geteuid() == 0
+        return self._is_root
 
     def requires_elevation(self, command: str) -> bool:
         """
@@ -81,6 +106,8 @@ class PrivilegeManager(LoggerMixin):
         command: List[str],
         prompt: Optional[str] = None,
         confirm: bool = True,
+        stdout: Optional[int] = subprocess.PIPE,
+        stderr: Optional[int] = subprocess.PIPE,
     ) -> Tuple[int, str, str]:
         """
         Execute a command with elevated privileges.
@@ -89,22 +116,227 @@ class PrivilegeManager(LoggerMixin):
             command: Command and arguments as list
             prompt: Custom prompt message
             confirm: Whether to show confirmation dialog
+            stdout: Destination for stdout; subprocess.DEVNULL skips the pipe
+                and decoding when the output is not needed
+            stderr: Destination for stderr, as for stdout
 
         Returns:
-            Tuple of (return_code, stdout, stderr)
+            Tuple of (return_code, stdout, stderr); streams that were not
+            captured are returned as empty strings
 
         Raises:
             PrivilegeError: If elevation fails
         """
         if self.is_root():
             # Already running as root
-            return self._execute_command(command)
+            return self._execute_command(command, stdout, stderr)
 
         if self.method == "none":
             # Try without elevation (may fail)
             self.logger.warning("Executing without privilege elevation", command=command)
-            return self._execute_command(command)
+            return self._execute_command(command, stdout, stderr)
+
+        if stdout in _SESSION_STREAMS and (
+            stderr in _SESSION_STREAMS or stderr == subprocess.STDOUT
+        ):
+            response = self._session_request(command, stdout, stderr)
+            if response is not None:
+                return response
+
+        try:
+            return self._execute_command(self._elevate(command), stdout, stderr)
+        except subprocess.CalledProcessError as e:
+            raise PrivilegeError(f"Privilege elevation failed: {e}") from e
+
+    def _session_request(
+        self, command: List[str], stdout: int, stderr: int
+    ) -> Optional[Tuple[int, str, str]]:
+        """
+        Run a command through the elevated session worker.
+
+        Args:
+            command: Command and arguments
+            stdout: subprocess.PIPE or subprocess.DEVNULL
+            stderr: subprocess.PIPE, subprocess.DEVNULL or subprocess.STDOUT
+
+        Returns:
+            Tuple of (return_code, stdout, stderr), or None if no session is
+            available or it is busy with another command (the caller then
+            elevates the command on its own)
+
+        Raises:
+            PrivilegeError: If the command times out or cannot be started
+        """
+        request = {
+            "command": command,
+            "timeout": 60,
+            "stdout": _SESSION_STREAMS[stdout],
+            "stderr": "stdout" if stderr == subprocess.STDOUT else _SESSION_STREAMS[stderr],
+        }
+
+        # The worker runs one command at a time; rather than queue behind a
+        # long one, concurrent callers elevate their command on their own
+        if not self._session_lock.acquire(blocking=False):
+            return None
+        try:
+            session = self._get_session()
+            if session is None:
+                return None
+            self._session_last_used = time.monotonic()
+
+            self.logger.info("Running privileged command", command=" ".join(command))
+            try:
+                priv_worker.write_frame(session.stdin, request)
+                response: Optional[Dict[str, Any]] = priv_worker.read_frame(session.stdout)
+            except (OSError, ValueError):
+                response = None
+            if response is None:
+                # The worker died; a later call starts a new one
+                self.logger.warning("Privileged session ended unexpectedly")
+                self._stop_session()
+                return None
+        finally:
+            self._session_lock.release()
+
+        error = response.get("error")
+        if error == "timeout":
+            raise PrivilegeError(f"Command timed out: {response.get('message')}")
+        if error is not None:
+            raise PrivilegeError(f"Command execution failed: {response.get('message')}")
+        return response["returncode"], response["stdout"], response["stderr"]
+
+    def _get_session(self) -> Optional[subprocess.Popen]:
+        """
+        Get the elevated session worker, starting it if needed.
+
+        Called with the session lock held. If the worker cannot be started
+        (e.g. sudo has no terminal to prompt on), sessions are disabled and
+        commands are elevated one at a time instead.
+
+        Returns:
+            Running worker process, or None if sessions are unavailable
+        """
+        if self._session is not None and self._session.poll() is None:
+            if time.monotonic() - self._session_last_used < self.cache_timeout:
+                return self._session
+            # Idle past the timeout (the timer has not stopped it yet)
+            self._stop_session()
+        if self._session_unavailable:
+            return None
+
+        worker = [sys.executable, "-I", "-u", _WORKER_PATH]
+        if self.method == "pkexec":
+            session_cmd = ["pkexec"] + worker
+        else:
+            # Without -S: stdin carries requests, so sudo must prompt on the tty
+            session_cmd = ["sudo"] + worker
+
+        self.logger.info("Starting privileged session", method=self.method)
+        try:
+            session = subprocess.Popen(session_cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+            ready = priv_worker.read_frame(session.stdout)
+        except (OSError, ValueError) as e:
+            self.logger.warning("Could not start privileged session", error=str(e))
+            self._session_unavailable = True
+            return None
+
+        if not isinstance(ready, dict) or not ready.get("ready"):
+            self.logger.warning("Privileged session unavailable; elevating per command")
+            if session.poll() is None:
+                session.kill()
+            session.wait()
+            self._session_unavailable = True
+            return None
+
+        self._session = session
+        self._schedule_idle_check(self.cache_timeout)
+        return session
+
+    def _schedule_idle_check(self, delay: float) -> None:
+        """Arm the idle timer to fire in delay seconds. Called with the session lock held."""
+        self._idle_timer = threading.Timer(delay, self._stop_idle_session)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _stop_idle_session(self) -> None:
+        """Stop the session once it has been idle for cache_timeout, or check again later."""
+        with self._session_lock:
+            self._idle_timer = None
+            if self._session is None:
+                return
+            idle = time.monotonic() - self._session_last_used
+            if idle < self.cache_timeout:
+                self._schedule_idle_check(self.cache_timeout - idle)
+                return
+            self.logger.info("Stopping idle privileged session")
+            self._stop_session()
+
+    def _stop_session(self) -> None:
+        """Stop the session worker. Called with the session lock held."""
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        session = self._session
+        self._session = None
+        if session is None:
+            return
+        try:
+            # The worker exits once its stdin is closed
+            session.stdin.close()
+            session.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            session.kill()
+            session.wait()
+        session.stdout.close()
+
+    def close(self) -> None:
+        """Stop the elevated session worker, if one is running."""
+        with self._session_lock:
+            self._stop_session()
+
+    def spawn_privileged(self, command: List[str], **popen_kwargs: Any) -> subprocess.Popen:
+        """
+        Start a long-running command with elevated privileges.
+
+        Unlike execute_privileged, the process is not waited for, so callers
+        can stream its output instead of paying a fork/exec per operation.
+
+        Args:
+            command: Command and arguments as list
+            **popen_kwargs: Extra arguments for subprocess.Popen
+
+        Returns:
+            Running process
 
+        Raises:
+            PrivilegeError: If the process cannot be started
+        """
+        if self.is_root():
+            elevated_cmd = command
+        elif self.method == "none":
+            self.logger.warning("Executing without privilege elevation", command=command)
+            elevated_cmd = command
+        else:
+            elevated_cmd = self._elevate(command)
+
+        try:
+            return subprocess.Popen(elevated_cmd, **popen_kwargs)
+        except Exception as e:
+            raise PrivilegeError(f"Command execution failed: {e}") from e
+
+    def _elevate(self, command: List[str]) -> List[str]:
+        """
+        Prefix a command with the configured elevation method.
+
+        Args:
+            command: Command and arguments
+
+        Returns:
+            Elevated command
+
+        Raises:
+            PrivilegeError: If the method is unsupported
+        """
         # Log the privileged operation
         self.logger.info(
             "Requesting privilege elevation",
@@ -112,25 +344,26 @@ class PrivilegeManager(LoggerMixin):
             method=self.method,
         )
 
-        # Build elevated command
         if self.method == "pkexec":
-            elevated_cmd = ["pkexec"] + command
+            return ["pkexec"] + command
         elif self.method == "sudo":
-            elevated_cmd = ["sudo", "-S"] + command  # -S reads password from stdin
+            return ["sudo", "-S"] + command  # -S reads password from stdin
         else:
             raise PrivilegeError(f"Unsupported method: {self.method}")
 
-        try:
-            return self._execute_command(elevated_cmd)
-        except subprocess.CalledProcessError as e:
-            raise PrivilegeError(f"Privilege elevation failed: {e}") from e
-
-    def _execute_command(self, command: List[str]) -> Tuple[int, str, str]:
+    def _execute_command(
+        self,
+        command: List[str],
+        stdout: Optional[int] = subprocess.PIPE,
+        stderr: Optional[int] = subprocess.PIPE,
+    ) -> Tuple[int, str, str]:
         """
         Execute a command directly.
 
         Args:
             command: Command and arguments
+            stdout: Destination for stdout
+            stderr: Destination for stderr
 
         Returns:
             Tuple of (return_code, stdout, stderr)
@@ -138,11 +371,12 @@ class PrivilegeManager(LoggerMixin):
         try:
             result = subprocess.run(
                 command,
-                capture_output=True,
+                stdout=stdout,
+                stderr=stderr,
                 text=True,
                 timeout=60,
             )
-            return result.returncode, result.stdout, result.stderr
+            return result.returncode, result.stdout or "", result.stderr or ""
         except subprocess.TimeoutExpired as e:
             raise PrivilegeError(f"Command timed out: {e}") from e
         except Exception as e:
@@ -152,28 +386,35 @@ class PrivilegeManager(LoggerMixin):
         """
         Check if user has necessary Bluetooth permissions.
 
+        The result is cached: group membership of a running process does not
+        change (new memberships apply from the next login).
+
         Returns:
             True if permissions are adequate
         """
-        # Check if user is in bluetooth group
-        try:
-            result = subprocess.run(
-                ["groups"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            groups = result.stdout.strip().split()
-            if "bluetooth" in groups or self.is_root():
-                return True
+        if self._bluetooth_permitted is None:
+            self._bluetooth_permitted = self._is_root or self._in_bluetooth_group()
+            if not self._bluetooth_permitted:
+                self.logger.warning(
+                    "User not in bluetooth group. Some operations may require elevation."
+                )
+        return self._bluetooth_permitted
+
+    def _in_bluetooth_group(self) -> bool:
+        """
+        Check if the process belongs to the bluetooth group.
 
-            self.logger.warning(
-                "User not in bluetooth group. Some operations may require elevation."
-            )
+        Returns:
+            True if the bluetooth group is one of the process's groups
+        """
+        try:
+            gid = grp.getgrnam("bluetooth").gr_gid
+        except KeyError:
             return False
         except Exception as e:
             self.logger.error("Failed to check groups", error=str(e))
             return False
+        return gid == os.getegid() or gid in os.getgroups()
 
     def setup_bluetooth_permissions(self) -> None:
         """Add user to bluetooth group (requires elevation)."""
@@ -188,7 +429,11 @@ class PrivilegeManager(LoggerMixin):
 
         try:
             self.logger.info(f"Adding user {username} to bluetooth group")
-            self.execute_privileged(["usermod", "-aG", "bluetooth", username])
+            self.execute_privileged(
+                ["usermod", "-aG", "bluetooth", username],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
             self.logger.info(
                 "Added to bluetooth group. Log out and back in for changes to take effect."
             )